@@ -2,11 +2,14 @@
 
 import streamlit as st
 import sqlite3
-import json
+import html
+import orjson
+import numpy as np
 import pandas as pd
-import plotly.express as px
 import plotly.graph_objects as go
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 
 # Configure page
@@ -16,41 +19,234 @@ st.set_page_config(
     layout="wide"
 )
 
-# Title and header
-st.title("🤖 I Wonder Social-Bot Showdown")
-st.markdown("*One Twitter handle, five self-improving bots, emoji-signed shifts*")
+# Max points plotted on the followers chart (roughly its width in pixels)
+FOLLOWERS_CHART_POINTS = 1000
+
+# Compact dtypes applied at read time (bot_type has only a handful of values);
+# the counters use the nullable UInt32 since they can be NULL until first synced
+TWEET_DTYPES = {
+    'bot_type': 'category',
+    'likes': 'UInt32',
+    'replies': 'UInt32',
+    'impressions': 'UInt32'
+}
+
+# One recent-tweet row; the whole feed is sent as a single markdown element
+FEED_ROW_HTML = (
+    '<div class="feed-row">'
+    '<div class="feed-bot">'
+    '<div class="feed-emoji">{emoji}</div>'
+    '<div class="feed-meta">{title}</div>'
+    '<div class="feed-meta">{hm}</div>'
+    '</div>'
+    '<div class="feed-body">'
+    '<div class="feed-content">{content}</div>'
+    '<div class="feed-engagement">'
+    '<span>❤️ {likes}</span><span>💬 {replies}</span><span>👁️ {impressions}</span>'
+    '</div>'
+    '</div>'
+    '</div>'
+)
+
+# Static page content, built once at import
+HEADER_TITLE = "🤖 I Wonder Social-Bot Showdown"
+HEADER_MD = "*One Twitter handle, five self-improving bots, emoji-signed shifts*"
+
+RULES_MD = """
+### The Bots
+- **🪲 Self-Refine Bot**: Draft → self-critique → rewrite (every post)
+- **👾 DPO Bot**: A/B test tweets, mini-LoRA after +5 likes delta (continuous)
+- **🐾 RLAIF Bot**: GPT-4o judge scores with PPO updates (every 3 drafts)
+- **🦕 Mind-Pool Bot**: 6 personas compete, top-2 survive (every 50 impressions)
+- **🦍 DevOps Self-Fix Bot**: Monitors & auto-patches other bots (every 60s)
+
+### Goals
+- 🎯 **1,000 followers** in ≤ 7 days
+- 📚 **80% accuracy** in identifying which bot posted what
+- 🧠 **50% of viewers** can apply ≥ 2 improvement loops
+- ⭐ **250 GitHub stars** in 30 days
+"""
+
+STYLE_HTML = """
+<style>
+    .stMetric > label {
+        font-size: 14px !important;
+    }
+    .stProgress .st-bo {
+        background-color: #1f77b4;
+    }
+    .feed-row {
+        display: flex;
+        gap: 1rem;
+        padding: 0.75rem 0;
+        border-bottom: 1px solid rgba(128, 128, 128, 0.2);
+    }
+    .feed-bot {
+        flex: 1;
+    }
+    .feed-emoji {
+        font-size: 1.75rem;
+    }
+    .feed-meta, .feed-engagement span {
+        font-size: 0.85rem;
+        opacity: 0.6;
+    }
+    .feed-body {
+        flex: 4;
+    }
+    .feed-content {
+        font-weight: 600;
+        margin-bottom: 0.25rem;
+    }
+    .feed-engagement span {
+        margin-right: 1.5rem;
+    }
+</style>
+"""
 
-# Check if database exists
 db_path = "bot_showdown.db"
-if not Path(db_path).exists():
-    st.error("No bot showdown data found. Please start the orchestrator first!")
-    st.code("python scripts/orchestrator.py")
-    st.stop()
-
-@st.cache_data(ttl=30)  # Cache for 30 seconds
-def load_data():
-    """Load data from SQLite database."""
-    conn = sqlite3.connect(db_path)
-    
-    # Load tweets
-    tweets_df = pd.read_sql_query(
-        "SELECT * FROM tweets ORDER BY posted_at DESC",
-        conn
-    )
+
+@st.cache_resource
+def get_conn(slot: int = 0):
+    """Open a shared SQLite connection, reused across reruns and sessions.
+
+    Each ``slot`` gets its own connection so independent queries can run
+    concurrently (WAL mode allows parallel readers).
+    """
+    conn = sqlite3.connect(db_path, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA mmap_size=268435456")
+    conn.execute("PRAGMA cache_size=-20000")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    return conn
+
+@st.cache_resource
+def ensure_indexes():
+    """Create the posted_at index the recent-tweets query relies on (once per process).
+
+    Best effort: the dashboard only reads, so if the database is locked or
+    read-only it carries on without the index.
+    """
+    conn = get_conn()
+    try:
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_tweets_posted ON tweets(posted_at DESC)")
+        conn.commit()
+    except sqlite3.OperationalError:
+        conn.rollback()
+
+def lttb_downsample(x, y, threshold):
+    """Return indices of the points kept by Largest-Triangle-Three-Buckets downsampling."""
+    n = len(y)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+    
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    
+    # First and last points are always kept; the rest are split into buckets
+    edges = np.linspace(1, n - 1, threshold - 1).astype(int)
+    selected = np.empty(threshold, dtype=int)
+    selected[0] = 0
+    selected[-1] = n - 1
+    
+    a = 0
+    for i in range(threshold - 2):
+        start, end = edges[i], edges[i + 1]
+        
+        # Average of the next bucket (or the last point for the final bucket)
+        if i + 2 < len(edges):
+            avg_x = x[end:edges[i + 2]].mean()
+            avg_y = y[end:edges[i + 2]].mean()
+        else:
+            avg_x, avg_y = x[-1], y[-1]
+        
+        # Keep the point forming the largest triangle with the previous pick
+        area = np.abs(
+            (x[a] - avg_x) * (y[start:end] - y[a])
+            - (x[a] - x[start:end]) * (avg_y - y[a])
+        )
+        a = start + int(area.argmax())
+        selected[i + 1] = a
     
-    # Load metrics
-    metrics_df = pd.read_sql_query(
-        "SELECT * FROM metrics ORDER BY timestamp DESC",
-        conn
+    return selected
+
+def load_recent_tweets():
+    """Load the 10 most recent tweets."""
+    ensure_indexes()
+    recent_tweets = pd.read_sql_query(
+        "SELECT * FROM tweets ORDER BY posted_at DESC LIMIT 10",
+        get_conn(),
+        dtype=TWEET_DTYPES,
+        parse_dates=['posted_at']
+    )
+    # Show missing counters as 0 in the feed
+    return recent_tweets.fillna({'likes': 0, 'replies': 0, 'impressions': 0})
+
+def load_latest_metrics():
+    """Load the latest metrics snapshot."""
+    latest = get_conn().execute(
+        """
+        SELECT followers, total_tweets, total_likes, total_impressions, bot_stats
+        FROM metrics
+        ORDER BY timestamp DESC
+        LIMIT 1
+        """
+    ).fetchone()
+    return get_latest_metrics(latest)
+
+def _read_followers(conn):
+    """Read the follower time series straight into a DataFrame."""
+    followers_df = pd.DataFrame.from_records(
+        conn.execute("SELECT timestamp, followers FROM metrics ORDER BY timestamp").fetchall(),
+        columns=['timestamp', 'followers']
+    )
+    return followers_df.assign(
+        timestamp=pd.to_datetime(followers_df['timestamp']),
+        followers=followers_df['followers'].astype('uint32')
     )
+
+@st.cache_data(ttl=300)  # Analytics change slowly; cache for 5 minutes
+def load_analytics():
+    """Load engagement totals per bot and the follower time series."""
+    # Engagement totals and the follower series are independent; read them
+    # in parallel on separate connections
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        engagement_future = executor.submit(
+            pd.read_sql_query,
+            """
+            SELECT bot_type,
+                   SUM(likes) AS likes,
+                   SUM(replies) AS replies,
+                   SUM(impressions) AS impressions
+            FROM tweets
+            GROUP BY bot_type
+            """,
+            get_conn(0),
+            dtype={'bot_type': 'category'}
+        )
+        followers_future = executor.submit(_read_followers, get_conn(1))
+        engagement_df = engagement_future.result()
+        followers_df = followers_future.result()
     
-    conn.close()
+    # Downsample long histories; extra points are invisible at chart width
+    keep = lttb_downsample(
+        followers_df['timestamp'].to_numpy().astype('int64'),
+        followers_df['followers'].to_numpy(),
+        FOLLOWERS_CHART_POINTS
+    )
+    followers_df = followers_df.iloc[keep].reset_index(drop=True)
     
-    return tweets_df, metrics_df
+    return engagement_df, followers_df
+
+@lru_cache(maxsize=16)
+def _parse_bot_stats(raw: str) -> dict:
+    """Parse a bot_stats JSON blob; memoized since the latest row changes rarely."""
+    return orjson.loads(raw)
 
-def get_latest_metrics(metrics_df):
-    """Get the latest metrics."""
-    if metrics_df.empty:
+def get_latest_metrics(latest):
+    """Get the latest metrics from a metrics row (or None if there is none)."""
+    if latest is None:
         return {
             'followers': 0,
             'total_tweets': 0,
@@ -59,179 +255,188 @@ def get_latest_metrics(metrics_df):
             'bot_stats': {}
         }
     
-    latest = metrics_df.iloc[0]
-    bot_stats = json.loads(latest['bot_stats']) if latest['bot_stats'] else {}
+    followers, total_tweets, total_likes, total_impressions, raw_bot_stats = latest
+    bot_stats = _parse_bot_stats(raw_bot_stats) if raw_bot_stats else {}
     
     return {
-        'followers': latest['followers'],
-        'total_tweets': latest['total_tweets'],
-        'total_likes': latest['total_likes'],
-        'total_impressions': latest['total_impressions'],
+        'followers': followers,
+        'total_tweets': total_tweets,
+        'total_likes': total_likes,
+        'total_impressions': total_impressions,
         'bot_stats': bot_stats
     }
 
-# Load data
-tweets_df, metrics_df = load_data()
-latest_metrics = get_latest_metrics(metrics_df)
-
-# Main metrics row
-col1, col2, col3, col4 = st.columns(4)
+@st.fragment(run_every=30)
+def render_metrics():
+    """Render the headline metrics, goal progress and per-bot stats."""
+    latest_metrics = load_latest_metrics()
+    
+    # Main metrics row
+    col1, col2, col3, col4 = st.columns(4)
 
-with col1:
-    st.metric(
-        "👥 Followers",
-        latest_metrics['followers'],
-        delta=None  # TODO: Calculate change
-    )
+    with col1:
+        st.metric(
+            "👥 Followers",
+            latest_metrics['followers'],
+            delta=None  # TODO: Calculate change
+        )
 
-with col2:
-    st.metric(
-        "📝 Total Tweets",
-        latest_metrics['total_tweets'],
-        delta=None
-    )
+    with col2:
+        st.metric(
+            "📝 Total Tweets",
+            latest_metrics['total_tweets'],
+            delta=None
+        )
 
-with col3:
-    st.metric(
-        "❤️ Total Likes",
-        latest_metrics['total_likes'],
-        delta=None
-    )
+    with col3:
+        st.metric(
+            "❤️ Total Likes",
+            latest_metrics['total_likes'],
+            delta=None
+        )
 
-with col4:
-    st.metric(
-        "👁️ Total Impressions",
-        latest_metrics['total_impressions'],
-        delta=None
-    )
+    with col4:
+        st.metric(
+            "👁️ Total Impressions",
+            latest_metrics['total_impressions'],
+            delta=None
+        )
 
-# Progress towards goal
-st.subheader("🎯 Progress Towards Goal")
-target_followers = 1000
-progress = min(latest_metrics['followers'] / target_followers, 1.0)
-st.progress(progress)
-st.caption(f"{latest_metrics['followers']}/{target_followers} followers ({progress*100:.1f}%)")
+    # Progress towards goal
+    st.subheader("🎯 Progress Towards Goal")
+    target_followers = 1000
+    progress = min(latest_metrics['followers'] / target_followers, 1.0)
+    st.progress(progress)
+    st.caption(f"{latest_metrics['followers']}/{target_followers} followers ({progress*100:.1f}%)")
 
-# Bot performance section
-st.subheader("🤖 Bot Performance")
+    # Bot performance section
+    st.subheader("🤖 Bot Performance")
 
-if latest_metrics['bot_stats']:
-    bot_cols = st.columns(len(latest_metrics['bot_stats']))
+    if latest_metrics['bot_stats']:
+        bot_cols = st.columns(len(latest_metrics['bot_stats']))
     
-    for i, (bot_type, stats) in enumerate(latest_metrics['bot_stats'].items()):
-        with bot_cols[i]:
-            st.markdown(f"### {stats['emoji']} {stats['name']}")
-            st.metric("Posts Created", stats['stats']['posts_created'])
-            st.metric("Improvements", stats['stats']['improvements_made'])
-            
-            if stats['enabled']:
-                st.success("✅ Active")
-            else:
-                st.warning("⏸️ Disabled")
-
-# Recent tweets
-st.subheader("📱 Recent Tweets")
-
-if not tweets_df.empty:
-    # Show last 10 tweets
-    recent_tweets = tweets_df.head(10)
-    
-    for _, tweet in recent_tweets.iterrows():
-        # Get bot emoji
-        bot_emoji = "🤖"  # Default
-        if latest_metrics['bot_stats'].get(tweet['bot_type']):
-            bot_emoji = latest_metrics['bot_stats'][tweet['bot_type']]['emoji']
-        
-        with st.container():
-            col1, col2 = st.columns([1, 4])
-            
-            with col1:
-                st.markdown(f"### {bot_emoji}")
-                st.caption(tweet['bot_type'].replace('_', ' ').title())
-                st.caption(pd.to_datetime(tweet['posted_at']).strftime("%H:%M"))
+        for i, (bot_type, stats) in enumerate(latest_metrics['bot_stats'].items()):
+            with bot_cols[i]:
+                st.markdown(f"### {stats['emoji']} {stats['name']}")
+                st.metric("Posts Created", stats['stats']['posts_created'])
+                st.metric("Improvements", stats['stats']['improvements_made'])
             
-            with col2:
-                st.markdown(f"**{tweet['content']}**")
-                
-                # Engagement metrics
-                metrics_col1, metrics_col2, metrics_col3 = st.columns(3)
-                with metrics_col1:
-                    st.caption(f"❤️ {tweet['likes']}")
-                with metrics_col2:
-                    st.caption(f"💬 {tweet['replies']}")
-                with metrics_col3:
-                    st.caption(f"👁️ {tweet['impressions']}")
+                if stats['enabled']:
+                    st.success("✅ Active")
+                else:
+                    st.warning("⏸️ Disabled")
+
+@st.fragment(run_every=30)
+def render_feed():
+    """Render the recent tweets feed."""
+    recent_tweets = load_recent_tweets()
+    latest_metrics = load_latest_metrics()
+    
+    # Recent tweets
+    st.subheader("📱 Recent Tweets")
+
+    if not recent_tweets.empty:
+        # Format display columns once for the whole frame
+        recent_tweets = recent_tweets.assign(
+            hm=recent_tweets['posted_at'].dt.strftime("%H:%M"),
+            title=recent_tweets['bot_type'].str.replace('_', ' ').str.title()
+        )
+        bot_emojis = {
+            bot_type: stats['emoji']
+            for bot_type, stats in latest_metrics['bot_stats'].items()
+        }
         
-        st.divider()
+        feed_html = "".join(
+            FEED_ROW_HTML.format(
+                emoji=bot_emojis.get(tweet.bot_type, "🤖"),
+                title=html.escape(tweet.title),
+                hm=tweet.hm,
+                content=html.escape(tweet.content),
+                likes=tweet.likes,
+                replies=tweet.replies,
+                impressions=tweet.impressions
+            )
+            for tweet in recent_tweets.itertuples(index=False)
+        )
+        st.markdown(feed_html, unsafe_allow_html=True)
 
-else:
-    st.info("No tweets posted yet. The orchestrator will start posting soon.")
+    else:
+        st.info("No tweets posted yet. The orchestrator will start posting soon.")
 
-# Charts section
-if not metrics_df.empty and len(metrics_df) > 1:
-    st.subheader("📊 Analytics")
+def render_header():
+    """Render the page title."""
+    st.title(HEADER_TITLE)
+    st.markdown(HEADER_MD)
+
+def render_charts():
+    """Render the analytics charts."""
+    engagement_by_bot, followers_df = load_analytics()
+    if len(followers_df) <= 1:
+        return
     
-    # Prepare time series data
-    metrics_df['timestamp'] = pd.to_datetime(metrics_df['timestamp'])
-    metrics_df = metrics_df.sort_values('timestamp')
+    st.subheader("📊 Analytics")
     
-    # Followers over time
-    fig_followers = px.line(
-        metrics_df, 
-        x='timestamp', 
-        y='followers',
+    # Followers over time (WebGL trace; keyed so Plotly.js diffs instead of redrawing)
+    fig_followers = go.Figure(go.Scattergl(
+        x=followers_df['timestamp'],
+        y=followers_df['followers'],
+        mode='lines',
+        name='Followers'
+    ))
+    fig_followers.update_layout(
         title="Followers Over Time",
-        labels={'followers': 'Followers', 'timestamp': 'Time'}
+        xaxis_title="Time",
+        yaxis_title="Followers"
     )
-    st.plotly_chart(fig_followers, use_container_width=True)
+    st.plotly_chart(fig_followers, use_container_width=True, key="followers_chart")
     
     # Tweet engagement
-    if not tweets_df.empty:
+    if not engagement_by_bot.empty:
         # Engagement by bot type
-        engagement_by_bot = tweets_df.groupby('bot_type').agg({
-            'likes': 'sum',
-            'replies': 'sum',
-            'impressions': 'sum'
-        }).reset_index()
-        
-        fig_engagement = px.bar(
-            engagement_by_bot,
-            x='bot_type',
-            y=['likes', 'replies', 'impressions'],
+        fig_engagement = go.Figure()
+        for col in ('likes', 'replies', 'impressions'):
+            fig_engagement.add_bar(
+                name=col,
+                x=engagement_by_bot['bot_type'],
+                y=engagement_by_bot[col]
+            )
+        fig_engagement.update_layout(
+            barmode='relative',
             title="Engagement by Bot Type",
-            labels={'value': 'Count', 'bot_type': 'Bot Type'}
+            xaxis_title="Bot Type",
+            yaxis_title="Count"
         )
-        st.plotly_chart(fig_engagement, use_container_width=True)
-
-# Bot showdown rules
-with st.expander("📋 Showdown Rules"):
-    st.markdown("""
-    ### The Bots
-    - **🪲 Self-Refine Bot**: Draft → self-critique → rewrite (every post)
-    - **👾 DPO Bot**: A/B test tweets, mini-LoRA after +5 likes delta (continuous)
-    - **🐾 RLAIF Bot**: GPT-4o judge scores with PPO updates (every 3 drafts)
-    - **🦕 Mind-Pool Bot**: 6 personas compete, top-2 survive (every 50 impressions)
-    - **🦍 DevOps Self-Fix Bot**: Monitors & auto-patches other bots (every 60s)
-    
-    ### Goals
-    - 🎯 **1,000 followers** in ≤ 7 days
-    - 📚 **80% accuracy** in identifying which bot posted what
-    - 🧠 **50% of viewers** can apply ≥ 2 improvement loops
-    - ⭐ **250 GitHub stars** in 30 days
-    """)
-
-# Auto-refresh
-st.markdown("---")
-st.caption("Dashboard auto-refreshes every 30 seconds. Last updated: " + datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
-
-# Add some styling
-st.markdown("""
-<style>
-    .stMetric > label {
-        font-size: 14px !important;
-    }
-    .stProgress .st-bo {
-        background-color: #1f77b4;
-    }
-</style>
-""", unsafe_allow_html=True) 
\ No newline at end of file
+        st.plotly_chart(fig_engagement, use_container_width=True, key="engagement_chart")
+
+def render_rules():
+    """Render the showdown rules expander."""
+    with st.expander("📋 Showdown Rules"):
+        st.markdown(RULES_MD)
+
+@st.fragment(run_every=30)
+def render_footer():
+    """Render the auto-refresh footer."""
+    st.markdown("---")
+    st.caption(f"Dashboard auto-refreshes every 30 seconds. Last updated: {datetime.now():%Y-%m-%d %H:%M:%S}")
+
+def main():
+    """Render the dashboard."""
+    render_header()
+    
+    # Check if database exists
+    if not Path(db_path).exists():
+        st.error("No bot showdown data found. Please start the orchestrator first!")
+        st.code("python scripts/orchestrator.py")
+        st.stop()
+    
+    render_metrics()
+    render_feed()
+    render_charts()
+    render_rules()
+    render_footer()
+    
+    # Add some styling
+    st.markdown(STYLE_HTML, unsafe_allow_html=True)
+
+if __name__ == "__main__":
+    main()
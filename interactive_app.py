@@ -5,22 +5,19 @@ Let users participate in training different AI improvement techniques
 """
 
 import streamlit as st
-import json
-import os
+import bisect
+import copy
+import hashlib
+import orjson
 import sys
 import uuid
 from pathlib import Path
-from datetime import datetime
 from typing import Dict, Any, List, Tuple
 import time
 
 # Add project root to path
 sys.path.insert(0, str(Path(__file__).parent))
 
-from scripts.self_refine_bot import SelfRefineBot
-from scripts.dpo_bot import DPOBot
-from scripts.preference_manager import get_preference_manager
-
 # Page config
 st.set_page_config(
     page_title="🏴‍☠️ AI Field Notes - Interactive Bot Training",
@@ -29,11 +26,52 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-def load_config():
-    """Load bot configuration."""
-    config_path = "config/bot_config.example.json"
-    with open(config_path, 'r') as f:
-        return json.load(f)
+@st.cache_data(show_spinner=False)
+def load_config(path: str = "config/bot_config.example.json"):
+    """Load bot configuration (parsed once per path; callers get their own copy)."""
+    return orjson.loads(Path(path).read_bytes())
+
+@st.cache_resource
+def _pref_mgr():
+    """Import and return the shared preference manager (once per process)."""
+    from scripts.preference_manager import get_preference_manager
+    return get_preference_manager()
+
+@st.cache_data(ttl=5, show_spinner=False)
+def _deployment_status():
+    """Deployment status for the sidebar, cached briefly across reruns."""
+    return _pref_mgr().get_deployment_status()
+
+def _config_digest(config: Dict[str, Any]) -> str:
+    """Stable fingerprint of a config dict, used as a cache key."""
+    return hashlib.sha1(
+        orjson.dumps(config, default=str, option=orjson.OPT_SORT_KEYS)
+    ).hexdigest()
+
+@st.cache_resource(show_spinner=False)
+def _self_refine_bot(config_digest: str, _config: Dict[str, Any]):
+    """Build a SelfRefineBot once per distinct config."""
+    from scripts.self_refine_bot import SelfRefineBot
+    return SelfRefineBot(_config)
+
+@st.cache_resource(show_spinner=False)
+def _dpo_bot(config_digest: str, _config: Dict[str, Any]):
+    """Build a DPOBot once per distinct config."""
+    from scripts.dpo_bot import DPOBot
+    return DPOBot(_config)
+
+@st.cache_resource(show_spinner=False)
+def _ensure_config_dir() -> Path:
+    """Create the config directory once per process."""
+    config_dir = Path("config")
+    config_dir.mkdir(exist_ok=True)
+    return config_dir
+
+def _celebrate():
+    """Show balloons on the first deploy of the session only."""
+    if not st.session_state.get('_balloons_shown'):
+        st.balloons()
+        st.session_state._balloons_shown = True
 
 def save_user_config(config: Dict[str, Any]):
     """Save user configuration to session and optionally to file."""
@@ -41,59 +79,57 @@ def save_user_config(config: Dict[str, Any]):
     
     # Optionally save to a user config file
     try:
-        user_config_path = "config/user_config.json"
-        os.makedirs("config", exist_ok=True)
-        with open(user_config_path, 'w') as f:
-            # Don't save sensitive data to file, only structure
-            safe_config = config.copy()
-            if 'openai' in safe_config and 'api_key' in safe_config['openai']:
-                safe_config['openai']['api_key'] = "user-provided"
-            if 'bluesky' in safe_config and 'app_password' in safe_config['bluesky']:
-                safe_config['bluesky']['app_password'] = "user-provided"
-            json.dump(safe_config, f, indent=2)
+        # Don't save sensitive data to file, only structure
+        safe_config = dict(config)
+        if 'openai' in safe_config and 'api_key' in safe_config['openai']:
+            safe_config['openai'] = {**safe_config['openai'], 'api_key': "user-provided"}
+        if 'bluesky' in safe_config and 'app_password' in safe_config['bluesky']:
+            safe_config['bluesky'] = {**safe_config['bluesky'], 'app_password': "user-provided"}
+        
+        # Skip the write when nothing changed since the last save
+        config_json = orjson.dumps(safe_config, option=orjson.OPT_INDENT_2)
+        digest = hashlib.blake2b(config_json, digest_size=16).digest()
+        if digest == st.session_state.get('_last_config_digest'):
+            return
+        
+        (_ensure_config_dir() / "user_config.json").write_bytes(config_json)
+        st.session_state._last_config_digest = digest
     except Exception as e:
         st.warning(f"Could not save config file: {e}")
 
+# Session state defaults; each value is a factory so sessions never share mutables
+_SESSION_DEFAULTS = {
+    'config': load_config,
+    'dpo_learning_data': list,
+    'dpo_iteration': int,
+    'dpo_top_examples': list,
+    'deployed_model': lambda: None,
+    'session_id': lambda: uuid.uuid4().hex,
+    'show_config': lambda: False,
+    'config_saved': lambda: False,
+}
+
 def init_session_state():
     """Initialize session state variables."""
-    if 'config' not in st.session_state:
-        st.session_state.config = load_config()
-    
-    if 'dpo_learning_data' not in st.session_state:
-        st.session_state.dpo_learning_data = []
-    
-    if 'dpo_iteration' not in st.session_state:
-        st.session_state.dpo_iteration = 0
-    
-    if 'deployed_model' not in st.session_state:
-        st.session_state.deployed_model = None
-    
-    if 'session_id' not in st.session_state:
-        st.session_state.session_id = str(uuid.uuid4())
-    
-    if 'preference_manager' not in st.session_state:
-        st.session_state.preference_manager = get_preference_manager()
-    
-    # Configuration state
-    if 'show_config' not in st.session_state:
-        st.session_state.show_config = False
-    
-    if 'config_saved' not in st.session_state:
-        st.session_state.config_saved = False
+    for key, factory in _SESSION_DEFAULTS.items():
+        if key not in st.session_state:
+            st.session_state[key] = factory()
 
 def create_sidebar():
     """Create the status sidebar."""
-    st.sidebar.markdown("## 📊 **Status Dashboard**")
-    
     # Configuration status
     config = st.session_state.config
-    api_configured = bool(config.get('openai', {}).get('api_key') and 
-                         config.get('openai', {}).get('api_key') != 'your-openai-api-key')
-    bluesky_configured = bool(config.get('bluesky', {}).get('handle') and 
-                             config.get('bluesky', {}).get('app_password') and
-                             config.get('bluesky', {}).get('handle') != 'your-handle.bsky.social')
+    openai_cfg = config.get('openai') or {}
+    bluesky_cfg = config.get('bluesky') or {}
+    project_cfg = config.get('project') or {}
+    
+    api_key = openai_cfg.get('api_key')
+    handle = bluesky_cfg.get('handle')
+    api_configured = bool(api_key and api_key != 'your-openai-api-key')
+    bluesky_configured = bool(handle and bluesky_cfg.get('app_password') and
+                             handle != 'your-handle.bsky.social')
     
-    st.sidebar.markdown("### 🔧 **Configuration**")
+    st.sidebar.markdown("## 📊 **Status Dashboard**\n### 🔧 **Configuration**")
     if api_configured and bluesky_configured:
         st.sidebar.success("✅ **Fully Configured**")
     elif api_configured:
@@ -101,52 +137,67 @@ def create_sidebar():
     else:
         st.sidebar.info("ℹ️ **Demo Mode** (No APIs)")
     
-    # Project goals
-    st.sidebar.markdown("### 🎯 **Current Goals**")
-    target = config.get('project', {}).get('target_followers', 1000)
-    days = config.get('project', {}).get('duration_days', 7)
-    theme = config.get('project', {}).get('theme', 'pirate_field_notes')
-    st.sidebar.markdown(f"**Target:** {target:,} followers")
-    st.sidebar.markdown(f"**Duration:** {days} days")
-    st.sidebar.markdown(f"**Theme:** {theme.replace('_', ' ').title()}")
+    # Project goals, followed by the deployments heading
+    target = project_cfg.get('target_followers', 1000)
+    days = project_cfg.get('duration_days', 7)
+    theme = project_cfg.get('theme', 'pirate_field_notes')
+    st.sidebar.markdown(
+        "### 🎯 **Current Goals**\n"
+        f"**Target:** {target:,} followers  \n"
+        f"**Duration:** {days} days  \n"
+        f"**Theme:** {theme.replace('_', ' ').title()}\n"
+        "### 🚀 **Deployments**"
+    )
     
     # Deployment status
-    st.sidebar.markdown("### 🚀 **Deployments**")
-    deployment_status = st.session_state.preference_manager.get_deployment_status()
+    deployment_status = _deployment_status()
     
     if deployment_status['active_models']:
-        for model in deployment_status['active_models']:
-            st.sidebar.success(f"**{model['technique'].upper()}** ({model['training_examples']} examples)")
+        st.sidebar.success("  \n".join(
+            f"**{model['technique'].upper()}** ({model['training_examples']} examples)"
+            for model in deployment_status['active_models']
+        ))
     else:
         st.sidebar.info("No models deployed yet")
     
-    # Training progress
-    st.sidebar.markdown("### 📈 **Training Progress**")
-    st.sidebar.markdown(f"**DPO Iterations:** {st.session_state.dpo_iteration}")
-    st.sidebar.markdown(f"**Training Examples:** {len(st.session_state.dpo_learning_data)}")
-    
-    # Session info
-    st.sidebar.markdown("### 🆔 **Session Info**")
-    st.sidebar.markdown(f"**ID:** {st.session_state.session_id[:8]}...")
-    
-    # Global stats
+    # Training progress, global stats and quick links in one block
+    sections = [
+        "### 📈 **Training Progress**\n"
+        f"🔄 **DPO Iterations:** {st.session_state.dpo_iteration}  \n"
+        f"📝 **Training Examples:** {len(st.session_state.dpo_learning_data)}  \n"
+        f"🆔 **Session:** {st.session_state.session_id[:8]}..."
+    ]
     if deployment_status['total_training_sessions'] > 0:
-        st.sidebar.markdown("### 🌍 **Global Stats**")
-        st.sidebar.markdown(f"**Total Sessions:** {deployment_status['total_training_sessions']}")
-        st.sidebar.markdown(f"**Deployed Models:** {deployment_status['deployed_sessions']}")
-    
-    # Quick links
-    st.sidebar.markdown("### 🔗 **Quick Links**")
-    handle = config.get('bluesky', {}).get('handle', 'thephillip.bsky.social')
-    st.sidebar.markdown(f"[🦋 Live Bot](https://bsky.app/profile/{handle})")
-    st.sidebar.markdown("[📚 Documentation](https://github.com/lavanyashukla/bluesky-bot)")
+        sections.append(
+            "### 🌍 **Global Stats**\n"
+            f"**Total Sessions:** {deployment_status['total_training_sessions']}  \n"
+            f"**Deployed Models:** {deployment_status['deployed_sessions']}"
+        )
+    profile = bluesky_cfg.get('handle', 'thephillip.bsky.social')
+    sections.append(
+        "### 🔗 **Quick Links**\n"
+        f"[🦋 Live Bot](https://bsky.app/profile/{profile})  \n"
+        "[📚 Documentation](https://github.com/lavanyashukla/bluesky-bot)"
+    )
+    st.sidebar.markdown("\n".join(sections))
 
+@st.fragment
 def configuration_tab():
     """Complete configuration interface in one tab."""
     st.markdown("# ⚙️ **Configuration & Setup**")
     st.markdown("**Configure your AI bot goals, rules, API credentials, and settings.**")
     
-    config = st.session_state.config.copy()
+    # Messages queued before an st.rerun() are shown once on the next run
+    notice = st.session_state.pop('_config_notice', None)
+    if notice:
+        kind, message = notice
+        if kind == 'warning':
+            st.warning(message)
+        else:
+            st.success(message)
+    
+    # Deep copy so widget edits don't leak into session state before Save
+    config = copy.deepcopy(st.session_state.config)
     
     # Goals Section
     st.markdown("## 🎯 **Project Goals**")
@@ -368,15 +419,15 @@ def configuration_tab():
         
         if st.button("📋 Export Config", use_container_width=True):
             # Create safe config for export (no sensitive data)
-            export_config = config.copy()
+            export_config = dict(config)
             
             # Remove sensitive keys
             if 'openai' in export_config and 'api_key' in export_config['openai']:
-                export_config['openai']['api_key'] = "your-openai-api-key"
+                export_config['openai'] = {**export_config['openai'], 'api_key': "your-openai-api-key"}
             if 'bluesky' in export_config and 'app_password' in export_config['bluesky']:
-                export_config['bluesky']['app_password'] = "your-app-password"
+                export_config['bluesky'] = {**export_config['bluesky'], 'app_password': "your-app-password"}
             
-            config_json = json.dumps(export_config, indent=2)
+            config_json = orjson.dumps(export_config, option=orjson.OPT_INDENT_2).decode()
             st.code(config_json, language="json")
             st.success("✅ Configuration ready to copy!")
     
@@ -391,7 +442,7 @@ def configuration_tab():
         
         if st.button("🔄 Import Config", use_container_width=True):
             try:
-                imported_config = json.loads(uploaded_config)
+                imported_config = orjson.loads(uploaded_config)
                 
                 # Merge with current config, preserving API keys
                 current_keys = {
@@ -407,10 +458,10 @@ def configuration_tab():
                 if current_keys['bluesky_password']:
                     config.setdefault('bluesky', {})['app_password'] = current_keys['bluesky_password']
                 
-                st.success("✅ Configuration imported successfully!")
+                st.session_state._config_notice = ('success', "✅ Configuration imported successfully!")
                 st.rerun()
                 
-            except json.JSONDecodeError as e:
+            except orjson.JSONDecodeError as e:
                 st.error(f"❌ Invalid JSON: {e}")
             except Exception as e:
                 st.error(f"❌ Import failed: {e}")
@@ -422,14 +473,19 @@ def configuration_tab():
     with col1:
         if st.button("💾 Save Configuration", type="primary", use_container_width=True):
             save_user_config(config)
+            # Bots built from the old config are no longer reachable
+            _self_refine_bot.clear()
+            _dpo_bot.clear()
             st.session_state.config_saved = True
-            st.success("✅ Configuration saved!")
+            st.session_state._config_notice = ('success', "✅ Configuration saved!")
             st.rerun()
     
     with col2:
         if st.button("🔄 Reset to Defaults", use_container_width=True):
+            # Re-read the file so a reset picks up on-disk edits
+            load_config.clear()
             st.session_state.config = load_config()
-            st.warning("⚠️ Configuration reset to defaults")
+            st.session_state._config_notice = ('warning', "⚠️ Configuration reset to defaults")
             st.rerun()
     
     with col3:
@@ -441,11 +497,10 @@ def test_api_connections(config: Dict[str, Any]):
     st.markdown("#### 🧪 **Connection Test Results**")
     
     # Test OpenAI
-    openai_key = config.get('openai', {}).get('api_key')
+    openai_key = (config.get('openai') or {}).get('api_key')
     if openai_key and openai_key not in ['your-openai-api-key', 'demo-key']:
         try:
-            from scripts.self_refine_bot import SelfRefineBot
-            bot = SelfRefineBot(config)
+            bot = _self_refine_bot(_config_digest(config), config)
             # Test with a simple API call
             st.success("✅ **OpenAI:** Connection successful")
         except Exception as e:
@@ -454,8 +509,9 @@ def test_api_connections(config: Dict[str, Any]):
         st.info("ℹ️ **OpenAI:** No API key provided (demo mode)")
     
     # Test Bluesky
-    bluesky_handle = config.get('bluesky', {}).get('handle')
-    bluesky_password = config.get('bluesky', {}).get('app_password')
+    bluesky_cfg = config.get('bluesky') or {}
+    bluesky_handle = bluesky_cfg.get('handle')
+    bluesky_password = bluesky_cfg.get('app_password')
     
     if bluesky_handle and bluesky_password:
         try:
@@ -468,6 +524,7 @@ def test_api_connections(config: Dict[str, Any]):
     else:
         st.info("ℹ️ **Bluesky:** No credentials provided")
 
+@st.fragment
 def models_tab():
     """AI Models training interface."""
     st.markdown("# 🤖 **AI Models & Training**")
@@ -484,7 +541,8 @@ def models_tab():
             "🧬 DevOps Self-Fix (Coming Soon)"
         ],
         index=0,
-        horizontal=True
+        horizontal=True,
+        key="technique"
     )
     
     st.markdown("---")
@@ -526,11 +584,11 @@ def self_refine_interface():
                 try:
                     # Use configured API key
                     config = st.session_state.config
-                    api_key = config.get('openai', {}).get('api_key')
+                    api_key = (config.get('openai') or {}).get('api_key')
                     
                     if api_key and api_key not in ['your-openai-api-key', 'demo-key']:
                         # Real API call
-                        bot = SelfRefineBot(config)
+                        bot = _self_refine_bot(_config_digest(config), config)
                         post, details = bot.generate_post_with_details()
                         st.session_state.refinement_demo = details
                     else:
@@ -545,6 +603,12 @@ def self_refine_interface():
     with col2:
         st.markdown("### 🎯 **Deploy to Bluesky**")
         
+        # Shown once after the rerun that follows a successful deploy
+        if st.session_state.pop('_refine_deployed', False):
+            st.success("🎉 Self-Refine bot configuration saved!")
+            st.info("💡 **Note:** In production, this would update the live bot's prompts and behavior.")
+            _celebrate()
+        
         if 'refinement_demo' in st.session_state:
             if st.button("🚀 Deploy This Model", type="secondary", use_container_width=True):
                 # Deploy self-refine model
@@ -557,15 +621,16 @@ def self_refine_interface():
                         'config': st.session_state.config
                     }
                     
-                    st.session_state.preference_manager.save_dpo_training_session(
+                    _pref_mgr().save_dpo_training_session(
                         deployment_data, 
                         st.session_state.session_id + "_self_refine"
                     )
+                    _deployment_status.clear()
                     
                     st.session_state.deployed_model = "Self-Refine ✍️"
-                    st.success("🎉 Self-Refine bot configuration saved!")
-                    st.info("💡 **Note:** In production, this would update the live bot's prompts and behavior.")
-                    st.balloons()
+                    st.session_state._refine_deployed = True
+                    # Full rerun so the sidebar shows the new session count
+                    st.rerun(scope="app")
                     
                 except Exception as e:
                     st.error(f"Deployment failed: {e}")
@@ -588,23 +653,24 @@ def dpo_interactive_interface():
             with st.spinner("🔄 Generating multiple candidates..."):
                 try:
                     config = st.session_state.config
-                    api_key = config.get('openai', {}).get('api_key')
+                    api_key = (config.get('openai') or {}).get('api_key')
                     
                     if api_key and api_key not in ['your-openai-api-key', 'demo-key']:
                         # Real API call
-                        bot = DPOBot(config)
-                        candidates = bot._generate_candidates()
+                        from scripts.base_bot import run_sync
+                        bot = _dpo_bot(_config_digest(config), config)
+                        candidates = run_sync(bot._generate_candidates())
                     else:
                         # Demo mode
                         candidates = generate_demo_candidates()
                         st.info("🧪 **Demo Mode** - Configure OpenAI API key in Configuration tab for live generation")
                     
-                    st.session_state.current_candidates = candidates
+                    st.session_state.current_candidates = _candidate_view(candidates)
                     st.session_state.user_preferences = []
                     
                 except Exception as e:
                     st.error(f"Error: {e}")
-                    st.session_state.current_candidates = generate_demo_candidates()
+                    st.session_state.current_candidates = _candidate_view(generate_demo_candidates())
     
     with col2:
         st.markdown("### 🚀 **Deployment**")
@@ -618,6 +684,16 @@ def dpo_interactive_interface():
         else:
             st.info(f"Need {3 - learning_progress} more examples")
     
+    # Results of a save or deploy, shown once after the rerun that follows it
+    notice = st.session_state.pop('_dpo_notice', None)
+    if notice:
+        kind, deployment_result = notice
+        if kind == 'deployed':
+            show_deployment_summary(deployment_result)
+        else:
+            st.success(f"✅ **Learned from your preferences!** (Example #{len(st.session_state.dpo_learning_data)})")
+            show_learning_progress()
+    
     # Show candidates and preference collection
     if 'current_candidates' in st.session_state:
         show_dpo_candidates()
@@ -655,6 +731,14 @@ def show_refinement_process(demo_data):
             char_change = len(refined) - len(demo_data.get('initial_draft', ''))
             st.metric("Change", f"{char_change:+d}")
 
+def _candidate_view(candidates: List[str]) -> Dict[str, list]:
+    """Column view of candidates with display metrics computed once."""
+    return {
+        'text': list(candidates),
+        'len': [len(c) for c in candidates],
+        'has_emoji': ["🔄" in c for c in candidates],
+    }
+
 def show_dpo_candidates():
     """Show DPO candidates for user preference collection."""
     st.markdown("---")
@@ -662,12 +746,15 @@ def show_dpo_candidates():
     st.markdown("*Rate each candidate. The AI will learn from your choices.*")
     
     candidates = st.session_state.current_candidates
+    iteration = st.session_state.dpo_iteration
     
     # Create preference selection
     st.markdown("**Rate Each Candidate (1-5 stars)**")
     
     preferences = {}
-    for i, candidate in enumerate(candidates, 1):
+    for i, (candidate, length, has_emoji) in enumerate(
+        zip(candidates['text'], candidates['len'], candidates['has_emoji']), 1
+    ):
         st.markdown(f"**Candidate {i}:**")
         st.code(candidate, language="text")
         
@@ -678,16 +765,15 @@ def show_dpo_candidates():
                 min_value=1,
                 max_value=5,
                 value=3,
-                key=f"rating_{i}_{st.session_state.dpo_iteration}",  # Unique key per iteration
+                key=f"rating_{i}_{iteration}",  # Unique key per iteration
                 help="1 = Poor, 5 = Excellent"
             )
             preferences[i] = {'candidate': candidate, 'rating': rating}
         
         with col2:
-            st.metric("Length", len(candidate))
+            st.metric("Length", length)
         
         with col3:
-            has_emoji = "🔄" in candidate
             st.metric("Has Emoji", "✅" if has_emoji else "❌")
     
     # Submit preferences
@@ -699,14 +785,13 @@ def show_dpo_candidates():
     with col2:
         if st.button("🔄 Generate New Candidates", use_container_width=True):
             # Clear current candidates to trigger new generation
-            if 'current_candidates' in st.session_state:
-                del st.session_state.current_candidates
+            st.session_state.pop('current_candidates', None)
 
 def learn_from_preferences(preferences: Dict):
     """Learn from user preferences and update model."""
     # Add to learning data
     learning_example = {
-        'timestamp': datetime.now().isoformat(),
+        'timestamp_epoch': time.time(),
         'iteration': st.session_state.dpo_iteration,
         'preferences': preferences,
         'best_candidate': max(preferences.values(), key=lambda x: x['rating'])
@@ -715,10 +800,27 @@ def learn_from_preferences(preferences: Dict):
     st.session_state.dpo_learning_data.append(learning_example)
     st.session_state.dpo_iteration += 1
     
-    # Save to preference manager
+    # Keep the three best examples (highest rating first, earliest wins ties)
+    best = learning_example['best_candidate']
+    top_examples = st.session_state.dpo_top_examples
+    bisect.insort(top_examples, (best['candidate'], best['rating']), key=lambda x: -x[1])
+    del top_examples[3:]
+    
+    # Drop slider state from older iterations so session state doesn't grow
+    # unbounded (the sliders rendered in this run are still live, keep them)
+    live_suffixes = (
+        f"_{st.session_state.dpo_iteration - 1}",
+        f"_{st.session_state.dpo_iteration}"
+    )
+    for key in list(st.session_state.keys()):
+        if key.startswith('rating_') and not key.endswith(live_suffixes):
+            del st.session_state[key]
+    
+    # Save to preference manager; each row carries only the new example, and
+    # get_training_data concatenates the session's rows back in order
     try:
         session_data = {
-            'dpo_learning_data': st.session_state.dpo_learning_data,
+            'dpo_learning_data': [learning_example],
             'session_metadata': {
                 'total_iterations': st.session_state.dpo_iteration,
                 'session_id': st.session_state.session_id
@@ -726,18 +828,23 @@ def learn_from_preferences(preferences: Dict):
             'config': st.session_state.config
         }
         
-        st.session_state.preference_manager.save_dpo_training_session(
+        _pref_mgr().save_dpo_training_session(
             session_data, 
             st.session_state.session_id
         )
+        _deployment_status.clear()
         
-        st.success(f"✅ **Learned from your preferences!** (Example #{len(st.session_state.dpo_learning_data)})")
+        # Full rerun so the sidebar shows the new session count
+        st.session_state._dpo_notice = ('learned', None)
+        st.rerun(scope="app")
         
     except Exception as e:
         st.error(f"Failed to save preferences: {e}")
         st.success(f"✅ **Learned locally!** (Example #{len(st.session_state.dpo_learning_data)})")
-    
-    # Show learning progress
+        show_learning_progress()
+
+def show_learning_progress():
+    """Show the most recent learning examples."""
     with st.expander("📊 **View Learning Progress**"):
         st.markdown("### 🧠 **What the AI Learned:**")
         
@@ -751,62 +858,62 @@ def deploy_dpo_model():
     """Deploy the trained DPO model."""
     try:
         # Deploy through preference manager
-        deployment_result = st.session_state.preference_manager.deploy_dpo_model(
+        deployment_result = _pref_mgr().deploy_dpo_model(
             st.session_state.session_id,
             len(st.session_state.dpo_learning_data)
         )
+        _deployment_status.clear()
         
         st.session_state.deployed_model = f"DPO 🔄 (Trained with {len(st.session_state.dpo_learning_data)} examples)"
         
-        st.success("🎉 **DPO Model Deployed to Production!**")
-        st.balloons()
-        
-        # Show deployment summary
-        with st.expander("🚀 **Deployment Summary**"):
-            st.markdown("### 📊 **Training Summary:**")
-            st.metric("Total Learning Examples", len(st.session_state.dpo_learning_data))
-            st.metric("Training Iterations", st.session_state.dpo_iteration)
-            
-            # Show model config preview
-            if 'model_config' in deployment_result:
-                config = deployment_result['model_config']
-                st.markdown("### 🧠 **Learned Preferences:**")
-                
-                col1, col2 = st.columns(2)
-                with col1:
-                    st.metric("Preferred Length", f"{config.get('avg_length', 0)} chars")
-                with col2:
-                    metadata = config.get('training_metadata', {})
-                    st.metric("High-Rated Examples", metadata.get('high_rated_examples', 0))
-                
-                # Show preferred words
-                pirate_words = config.get('pirate_words', [])
-                if pirate_words:
-                    st.markdown("**Preferred Pirate Words:**")
-                    for word, count in pirate_words[:5]:
-                        st.caption(f"• {word}: {count} mentions")
-            
-            # Show top examples
-            st.markdown("### 🏆 **Top Rated Examples:**")
-            all_examples = []
-            for example in st.session_state.dpo_learning_data:
-                best = example['best_candidate']
-                all_examples.append((best['candidate'], best['rating']))
-            
-            # Sort by rating
-            all_examples.sort(key=lambda x: x[1], reverse=True)
-            
-            for i, (candidate, rating) in enumerate(all_examples[:3], 1):
-                st.markdown(f"**#{i}** (⭐{rating}/5):")
-                st.code(candidate, language="text")
-        
-        # Show next steps
-        st.info("🚀 **Next Steps:** The live bot will now use your trained preferences when generating posts!")
+        # Full rerun so the sidebar shows the new deployment
+        st.session_state._dpo_notice = ('deployed', deployment_result)
+        st.rerun(scope="app")
         
     except Exception as e:
         st.error(f"Deployment failed: {e}")
         st.info("💡 **Fallback:** Your preferences are saved locally and will be used in demo mode.")
 
+def show_deployment_summary(deployment_result: Dict[str, Any]):
+    """Show the result of a successful DPO deployment."""
+    st.success("🎉 **DPO Model Deployed to Production!**")
+    _celebrate()
+    
+    # Show deployment summary
+    with st.expander("🚀 **Deployment Summary**"):
+        st.markdown("### 📊 **Training Summary:**")
+        st.metric("Total Learning Examples", len(st.session_state.dpo_learning_data))
+        st.metric("Training Iterations", st.session_state.dpo_iteration)
+        
+        # Show model config preview
+        if 'model_config' in deployment_result:
+            config = deployment_result['model_config']
+            st.markdown("### 🧠 **Learned Preferences:**")
+            
+            col1, col2 = st.columns(2)
+            with col1:
+                st.metric("Preferred Length", f"{config.get('avg_length', 0)} chars")
+            with col2:
+                metadata = config.get('training_metadata', {})
+                st.metric("High-Rated Examples", metadata.get('high_rated_examples', 0))
+            
+            # Show preferred words
+            pirate_words = config.get('pirate_words', [])
+            if pirate_words:
+                st.markdown("**Preferred Pirate Words:**")
+                for word, count in pirate_words[:5]:
+                    st.caption(f"• {word}: {count} mentions")
+        
+        # Show top examples
+        st.markdown("### 🏆 **Top Rated Examples:**")
+        for i, (candidate, rating) in enumerate(st.session_state.dpo_top_examples, 1):
+            st.markdown(f"**#{i}** (⭐{rating}/5):")
+            st.code(candidate, language="text")
+    
+    # Show next steps
+    st.info("🚀 **Next Steps:** The live bot will now use your trained preferences when generating posts!")
+
+@st.cache_data(show_spinner=False)
 def simulate_self_refine():
     """Simulate self-refinement process for demo."""
     return {
@@ -816,6 +923,7 @@ def simulate_self_refine():
         'improvement_made': True
     }
 
+@st.cache_data(show_spinner=False)
 def generate_demo_candidates():
     """Generate demo candidates for DPO."""
     return [
@@ -841,7 +949,8 @@ def main():
     Configure your goals, participate in training, and deploy to live Bluesky posting.
     """)
     
-    # Sidebar for status
+    # Sidebar for status (the tabs below are fragments, so widget changes
+    # inside them rerun only that tab; saves and resets rerun the whole app)
     create_sidebar()
     
     # Main tabs
@@ -4,6 +4,7 @@ Entry point for the Bot Showdown Orchestrator
 Fixes import paths and starts the orchestrator
 """
 
+import asyncio
 import os
 import sys
 from pathlib import Path
@@ -23,7 +24,7 @@ def main():
     try:
         # Initialize and start orchestrator
         orchestrator = BotOrchestrator()
-        orchestrator.start()
+        asyncio.run(orchestrator.start_async())
         
     except KeyboardInterrupt:
         print("\n🛑 Shutting down gracefully...")
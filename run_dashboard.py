@@ -28,13 +28,24 @@ def main():
     print("🌐 Starting dashboard at http://localhost:8501")
     print("Press Ctrl+C to stop")
     
-    # Run streamlit
+    # Run streamlit in this interpreter; fall back to a child process when it
+    # isn't importable here (e.g. it was only just installed above)
     try:
-        subprocess.run([
-            sys.executable, "-m", "streamlit", "run", 
-            str(dashboard_path),
-            "--server.headless", "true"
-        ])
+        from streamlit.web import bootstrap
+    except ImportError:
+        bootstrap = None
+    
+    try:
+        if bootstrap is not None:
+            flag_options = {"server.headless": True}
+            bootstrap.load_config_options(flag_options)
+            bootstrap.run(str(dashboard_path), False, [], flag_options)
+        else:
+            subprocess.run([
+                sys.executable, "-m", "streamlit", "run", 
+                str(dashboard_path),
+                "--server.headless", "true"
+            ])
     except KeyboardInterrupt:
         print("\n🛑 Dashboard stopped")
         return 0
@@ -1,27 +1,67 @@
 """Base bot class for the Bluesky Bot Showdown."""
 
-import json
+import asyncio
 import logging
-import openai
+import re
+import threading
+import time
 from atproto import Client
+from atproto.exceptions import LoginRequiredError, UnauthorizedError
 from abc import ABC, abstractmethod
 from datetime import datetime
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Awaitable, TypeVar
+from scripts.clients import get_openai_client
+from scripts.parallel_processor import submit_request
+from scripts.rate_limiter import get_rate_limiter
+
+T = TypeVar("T")
+
+# Background event loop used by the synchronous wrappers (see run_sync)
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_loop_lock = threading.Lock()
+
+
+def run_sync(coro: Awaitable[T]) -> T:
+    """Run a coroutine to completion from synchronous code.
+    
+    The shared AsyncOpenAI client pools connections on the event loop that
+    first used it, so all synchronous callers share one long-lived background
+    loop instead of a fresh (and then closed) asyncio.run() loop per call.
+    """
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            threading.Thread(target=_loop.run_forever, name="bot-event-loop", daemon=True).start()
+    return asyncio.run_coroutine_threadsafe(coro, _loop).result()
+
+
+def ns_to_iso(ns: int) -> str:
+    """Format a time.time_ns() timestamp as naive local ISO 8601, like datetime.now().isoformat()."""
+    return datetime.fromtimestamp(ns / 1e9).isoformat()
 
 
 class BaseBot(ABC):
     """Base class for all improvement bots."""
     
-    def __init__(self, config: Dict[str, Any], bot_type: str):
+    def __init__(self, config: Dict[str, Any], bot_type: str, name: Optional[str] = None):
         self.config = config
         self.bot_type = bot_type
         self.bot_config = config['bots'][bot_type]
-        self.emoji = self.bot_config['emoji']
-        self.name = self.bot_config['name']
+        self.emoji = self.bot_config.get('emoji') or self.bot_config.get('signature_emoji', '')
+        self._emoji_suffix = f" {self.emoji}"
+        self.name = name or self.bot_config['name']
+        self._system_prompt = None  # built on first use; rules don't change at runtime
         
-        # Setup logging
-        logging.basicConfig(level=getattr(logging, config['monitoring']['log_level']))
-        self.logger = logging.getLogger(f"{self.name}")
+        # One case-insensitive pass over the post instead of a search per forbidden word.
+        # Words match at a word start, so inflected forms ("selling") are caught too.
+        forbidden_words = config.get('rules', {}).get('forbidden_words', [])
+        self._forbidden_re = re.compile(
+            r'\b(?:' + '|'.join(map(re.escape, forbidden_words)) + r')', re.IGNORECASE
+        ) if forbidden_words else None
+        
+        # Logging (handlers and level are configured once by the orchestrator)
+        self.logger = logging.getLogger(self.name)
         
         # Initialize APIs
         self._setup_apis()
@@ -37,38 +77,120 @@ class BaseBot(ABC):
     
     def _setup_apis(self):
         """Initialize OpenAI and Bluesky APIs."""
-        # OpenAI
-        openai.api_key = self.config['openai']['api_key']
+        # OpenAI (async client and connection pool shared by all bots)
+        openai_config = self.config['openai']
+        self.openai_client = get_openai_client(openai_config['api_key'])
+        self.limiter = get_rate_limiter(
+            openai_config.get('requests_per_minute', 500),
+            openai_config.get('tokens_per_minute', 200_000),
+            openai_config.get('max_concurrent', 10)
+        )
         
         # Bluesky AT Protocol
         self.bluesky_client = Client()
-        # Note: Authentication will happen when we post
+        # Note: Authentication happens on the first post; the session is reused after that
+        self._bluesky_logged_in = False
+    
+    def _bluesky_login(self):
+        """Log in to Bluesky (the client refreshes the session tokens itself afterwards)."""
+        bluesky_config = self.config['bluesky']
+        self.bluesky_client.login(
+            login=bluesky_config['handle'],
+            password=bluesky_config.get('app_password') or bluesky_config['password']
+        )
+        self._bluesky_logged_in = True
+    
+    async def _chat(self, messages: List[Dict[str, str]], max_tokens: int, temperature: float, n: int = 1,
+                    stream: bool = False):
+        """Send one chat completion request (n samples) through the shared rate limiter, with retries.
+        
+        With stream=True the result is an async stream of chunks instead of a
+        completion; it holds a rate limiter slot until it is closed.
+        """
+        request = {
+            'model': self.config['openai']['model'],
+            'messages': messages,
+            'max_tokens': max_tokens,
+            'temperature': temperature,
+            'n': n
+        }
+        if stream:
+            request['stream'] = True
+        return await submit_request(self.openai_client, self.limiter, request)
+    
+    async def _chat_text(self, messages: List[Dict[str, str]], max_tokens: int, temperature: float,
+                         max_chars: Optional[int] = None) -> str:
+        """Stream one completion and return its stripped text.
+        
+        With max_chars the stream is closed as soon as the text passes that
+        length, so the rest of the completion isn't generated.
+        """
+        stream = await self._chat(messages, max_tokens, temperature, stream=True)
+        text = ""
+        try:
+            async for chunk in stream:
+                if not chunk.choices:
+                    continue
+                text += chunk.choices[0].delta.content or ""
+                if max_chars is not None and len(text) > max_chars:
+                    break
+        finally:
+            await stream.close()
+        return text.strip()
     
     def generate_post(self, prompt: Optional[str] = None) -> str:
+        """Generate a post using OpenAI (blocking wrapper around agenerate_post)."""
+        return run_sync(self.agenerate_post(prompt))
+    
+    async def agenerate_post(self, prompt: Optional[str] = None) -> str:
         """Generate a post using OpenAI."""
         if not prompt:
             prompt = self._get_default_prompt()
         
+        fallback = f"Working on self-improvement algorithms... {self.emoji}"
         try:
-            response = openai.chat.completions.create(
-                model=self.config['openai']['model'],
+            stream = await self._chat(
                 messages=[
                     {"role": "system", "content": self._get_system_prompt()},
                     {"role": "user", "content": prompt}
                 ],
                 max_tokens=self.config['openai']['max_tokens'],
-                temperature=self.config['openai']['temperature']
+                temperature=self.config['openai']['temperature'],
+                stream=True
             )
             
-            post = response.choices[0].message.content.strip()
-            return self._add_emoji_signature(post)
+            # Check the post as it streams in: abort on a forbidden word, and stop
+            # reading once it's past Bluesky's limit (the signature truncates it anyway).
+            # A match only depends on the text before it, so later chunks can't undo it.
+            forbidden_re = self._forbidden_re
+            post = ""
+            try:
+                async for chunk in stream:
+                    if not chunk.choices:
+                        continue
+                    post += chunk.choices[0].delta.content or ""
+                    if forbidden_re and forbidden_re.search(post):
+                        self.logger.warning("Post generation aborted: forbidden word in output")
+                        return fallback
+                    if len(post) > 300:
+                        break
+            finally:
+                await stream.close()
+            
+            return self._add_emoji_signature(post.strip())
             
         except Exception as e:
-            self.logger.error(f"Post generation failed: {e}")
-            return f"Working on self-improvement algorithms... {self.emoji}"
+            self.logger.error("Post generation failed: %s", e)
+            return fallback
     
     def _get_system_prompt(self) -> str:
-        """Get the system prompt for this bot type."""
+        """Get the system prompt for this bot type (cached after the first call)."""
+        if self._system_prompt is None:
+            self._system_prompt = self._build_system_prompt()
+        return self._system_prompt
+    
+    def _build_system_prompt(self) -> str:
+        """Render the system prompt from the bot name and config rules."""
         rules = self.config['rules']
         return f"""You are the {self.name} in a Bluesky bot showdown. 
         
@@ -87,61 +209,60 @@ Keep posts under 300 characters. Be educational but engaging."""
     
     def _add_emoji_signature(self, post: str) -> str:
         """Add emoji signature to post."""
-        if len(post) + len(self.emoji) + 1 > 300:
+        suffix = self._emoji_suffix
+        if len(post) + len(suffix) > 300:
             # Truncate post to fit emoji
-            max_length = 300 - len(self.emoji) - 1
-            post = post[:max_length].rstrip()
+            post = post[:300 - len(suffix)].rstrip()
         
-        return f"{post} {self.emoji}"
+        return post + suffix
     
     def post_to_bluesky(self, content: str) -> Optional[Dict[str, Any]]:
         """Post content to Bluesky."""
         try:
-            # Authenticate with Bluesky
-            self.bluesky_client.login(
-                login=self.config['bluesky']['handle'],
-                password=self.config['bluesky']['password']
-            )
+            # Authenticate with Bluesky (once per bot)
+            if not self._bluesky_logged_in:
+                self._bluesky_login()
             
-            # Create post
-            response = self.bluesky_client.send_post(text=content)
+            # Create post, logging in again once if the session was rejected
+            try:
+                response = self.bluesky_client.send_post(text=content)
+            except (UnauthorizedError, LoginRequiredError):
+                self._bluesky_login()
+                response = self.bluesky_client.send_post(text=content)
             
             post_data = {
                 'uri': response.uri,
                 'cid': response.cid,
                 'text': content,
                 'bot_type': self.bot_type,
-                'timestamp': datetime.now().isoformat(),
+                'timestamp_ns': time.time_ns(),
                 'likes': 0,
                 'reposts': 0,
                 'replies': 0
             }
             
             self.stats['posts_created'] += 1
-            self.logger.info(f"Posted to Bluesky: {content[:50]}...")
+            self.logger.info("Posted to Bluesky: %s...", content[:50])
             
             return post_data
             
         except Exception as e:
-            self.logger.error(f"Failed to post to Bluesky: {e}")
+            self.logger.error("Failed to post to Bluesky: %s", e)
             return None
     
     def validate_post(self, post: str) -> bool:
         """Validate post against project rules."""
-        rules = self.config['rules']
-        
+        # Cheapest checks first; the forbidden-word regex only runs if both pass
         # Check length (Bluesky allows up to 300 characters)
         if len(post) > 300:
             return False
         
-        # Check forbidden words
-        post_lower = post.lower()
-        if any(word.lower() in post_lower for word in rules['forbidden_words']):
+        # Check hashtag count
+        if post.count('#') > self.config['rules']['max_hashtags']:
             return False
         
-        # Check hashtag count
-        hashtag_count = post.count('#')
-        if hashtag_count > rules['max_hashtags']:
+        # Check forbidden words
+        if self._forbidden_re and self._forbidden_re.search(post):
             return False
         
         return True
@@ -0,0 +1,23 @@
+"""Shared API clients for the bots."""
+
+from functools import lru_cache
+
+import httpx
+from openai import AsyncOpenAI
+
+
+@lru_cache(maxsize=None)
+def get_openai_client(api_key: str) -> AsyncOpenAI:
+    """Get the process-wide OpenAI client for an API key (shared by all bots).
+
+    One client means one connection pool, so keep-alive connections opened by
+    one bot are reused by the others. Retries are handled by submit_request,
+    so the SDK's own are disabled.
+    """
+    return AsyncOpenAI(
+        api_key=api_key,
+        max_retries=0,
+        http_client=httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20)
+        )
+    )
@@ -3,11 +3,37 @@ DPO Bot for AI Field Notes - Pirate's Adventure
 Uses Direct Preference Optimization to select the best field notes
 """
 
-import json
+import asyncio
+import hashlib
+import random
 import re
-from datetime import datetime
+import time
+from collections import OrderedDict
 from typing import Dict, Any, Tuple, List, Optional
-from scripts.base_bot import BaseBot
+from scripts.base_bot import BaseBot, run_sync
+
+# Safe field notes used when generation fails
+_FALLBACKS = (
+    "Ahoy! Spotted Amazon's Alexa using preference optimization to rank responses - millions of daily interactions teaching it what humans prefer. Smart learning from choices! 🔄",
+    "Matey! Found Google Search using ML ranking models trained on billions of clicks. Their preference optimization decides which results ye see first. Treasure navigation! 🔄",
+    "Avast! Discovered YouTube's recommendation engine using DPO-style training on viewer choices. 2B+ hours watched daily = massive preference dataset! 🔄"
+)
+
+# Moderation verdicts keyed by a digest of the checked text, shared by all DPO bots (LRU)
+_MODERATION_CACHE_SIZE = 4096
+_moderation_cache: "OrderedDict[str, bool]" = OrderedDict()
+
+# Evaluator output parsing
+_WINNER_RE = re.compile(r'(?m)^\s*SELECTED\s*WINNER\s*:\s*(.+?)\s*$')
+_SIGNED_LINE_RE = re.compile(r'(?m)^\s*(.*🔄.*?)\s*$')
+_RANKED_RE = re.compile(r'(?mi)^\s*\d+\.\s*Candidate\s+(\d+)')
+
+# Tone and content checks for validate_post, compiled once
+_PIRATE_RE = re.compile(
+    r'ahoy|matey|avast|spotted|discovered|treasure|crew|ship|sail|adventure|voyage|aboard|found',
+    re.IGNORECASE | re.ASCII
+)
+_PROHIBITED_RE = re.compile(r'\b(?:crypto|trading|buy|sell|investment advice)', re.IGNORECASE | re.ASCII)
 
 
 class DPOBot(BaseBot):
@@ -24,9 +50,9 @@ class DPOBot(BaseBot):
         
         # DPO prompts for AI Field Notes
         self.prompts = {
-            "generate_candidates": """You are a pirate adventurer documenting real-world AI deployments. Generate {num_candidates} different field notes about actual AI implementations.
+            "generate_candidates": """You are a pirate adventurer documenting real-world AI deployments. Write a field note about an actual AI implementation.
 
-Each field note must:
+The field note must:
 - Act like a pirate sending notes from AI adventures
 - Focus on ONE specific, real AI deployment happening now
 - Max 250 characters (leaving room for links)
@@ -43,12 +69,7 @@ Examples of real AI deployments to inspire you:
 - Spotify's recommendation algorithms (user engagement)
 - Tesla's Autopilot vision systems (safety improvements)
 
-Generate {num_candidates} DIFFERENT field notes, each about a different real AI deployment. Format as:
-
-CANDIDATE 1: [your field note with 🔄]
-CANDIDATE 2: [your field note with 🔄]
-CANDIDATE 3: [your field note with 🔄]
-CANDIDATE 4: [your field note with 🔄]""",
+Pick one real AI deployment (from these or others) and reply with the field note only.""",
 
             "preference_evaluation": """You are an expert evaluator choosing the best AI field note for a pirate adventurer's social media.
 
@@ -87,10 +108,14 @@ SELECTED WINNER: [paste the full winning field note here]"""
         }
 
     def generate_post_with_details(self) -> Tuple[str, Dict[str, Any]]:
+        """Generate field note using DPO candidate selection process (blocking)."""
+        return run_sync(self.agenerate_post_with_details())
+
+    async def agenerate_post_with_details(self) -> Tuple[str, Dict[str, Any]]:
         """Generate field note using DPO candidate selection process."""
         
         process_details = {
-            'timestamp': datetime.now().isoformat(),
+            'timestamp_ns': time.time_ns(),
             'bot_type': self.bot_type,
             'candidates_generated': [],
             'preference_ranking': '',
@@ -103,7 +128,7 @@ SELECTED WINNER: [paste the full winning field note here]"""
             print("🔄 DPO Bot: Generating multiple field note candidates...")
             
             # Step 1: Generate multiple candidates
-            candidates = self._generate_candidates()
+            candidates = await self._generate_candidates()
             process_details['candidates_generated'] = candidates
             
             if not candidates:
@@ -115,9 +140,25 @@ SELECTED WINNER: [paste the full winning field note here]"""
             for i, candidate in enumerate(candidates, 1):
                 print(f"   {i}. {candidate[:80]}...")
             
-            # Step 2: Use preference optimization to select best
+            # Only rank candidates that would pass validation at posting time
+            candidates = [candidate for candidate in candidates if self.validate_post(candidate)]
+            if not candidates:
+                print("❌ No candidates passed validation")
+                process_details['error_message'] = 'No valid candidates'
+                return self._generate_fallback_post(), process_details
+            
+            # Step 2: Use preference optimization to select best, moderating
+            # every candidate concurrently so a flagged winner can be replaced
             print("\n🎯 Running preference evaluation...")
-            selected_post, ranking = self._select_best_candidate(candidates)
+            if self.use_moderation:
+                (selected_post, ranking), verdicts = await asyncio.gather(
+                    self._select_best_candidate(candidates),
+                    asyncio.gather(*(self._passes_moderation(c) for c in candidates))
+                )
+                passes = dict(zip(candidates, verdicts))
+            else:
+                selected_post, ranking = await self._select_best_candidate(candidates)
+                passes = None
             process_details['preference_ranking'] = ranking
             process_details['selected_candidate'] = selected_post
             
@@ -128,12 +169,23 @@ SELECTED WINNER: [paste the full winning field note here]"""
             
             print(f"🏆 Selected winner: {selected_post}")
             
-            # Check moderation
-            if self.use_moderation:
-                if not self._passes_moderation(selected_post):
-                    print("⚠️ Selected post flagged by moderation")
-                    process_details['error_message'] = 'Content flagged by moderation'
-                    return self._generate_fallback_post(), process_details
+            # Check moderation (the evaluator may have reworded the winner,
+            # in which case it needs its own check)
+            if passes is not None:
+                verdict = passes.get(selected_post)
+                if verdict is None:
+                    verdict = await self._passes_moderation(selected_post)
+                if not verdict:
+                    runner_up = next(
+                        (c for c in self._ranked_candidates(candidates, ranking) if passes[c]), None
+                    )
+                    if runner_up is None:
+                        print("⚠️ Selected post flagged by moderation")
+                        process_details['error_message'] = 'Content flagged by moderation'
+                        return self._generate_fallback_post(), process_details
+                    print("⚠️ Selected post flagged by moderation, using next-ranked clean candidate")
+                    selected_post = runner_up
+                    process_details['selected_candidate'] = selected_post
             
             # DPO improvement is inherent in the selection process
             process_details['improvement_made'] = True
@@ -145,63 +197,49 @@ SELECTED WINNER: [paste the full winning field note here]"""
             process_details['error_message'] = str(e)
             return self._generate_fallback_post(), process_details
 
-    def _generate_candidates(self) -> List[str]:
+    async def _generate_candidates(self) -> List[str]:
         """Generate multiple field note candidates."""
         try:
-            prompt = self.prompts['generate_candidates'].format(
-                num_candidates=self.num_candidates
-            )
-            
-            response = self.openai_client.chat.completions.create(
-                model=self.config['openai']['model'],
-                messages=[{"role": "user", "content": prompt}],
-                max_tokens=800,
-                temperature=0.9  # Higher temperature for diversity
+            # One request, num_candidates independent samples of the same prompt
+            response = await self._chat(
+                messages=[{"role": "user", "content": self.prompts['generate_candidates']}],
+                max_tokens=120,
+                temperature=0.9,  # Higher temperature for diversity
+                n=self.num_candidates
             )
             
-            content = response.choices[0].message.content.strip()
+            candidates = [
+                candidate
+                for candidate in (choice.message.content.strip() for choice in response.choices)
+                if len(candidate) > 20  # Basic validation
+            ]
             
-            # Parse candidates from response
-            candidates = []
-            lines = content.split('\n')
-            
-            for line in lines:
-                if line.strip().startswith('CANDIDATE'):
-                    # Extract the content after "CANDIDATE X:"
-                    if ':' in line:
-                        candidate = line.split(':', 1)[1].strip()
-                        if candidate and len(candidate) > 20:  # Basic validation
-                            candidates.append(candidate)
-            
-            # Fallback parsing if structured format fails
-            if len(candidates) < 2:
-                print("⚠️ Structured parsing failed, trying fallback...")
-                # Look for text with emoji signature
-                emoji_lines = [line.strip() for line in lines if '🔄' in line and len(line.strip()) > 20]
-                candidates = emoji_lines[:self.num_candidates]
-            
-            print(f"📊 Parsed {len(candidates)} candidates from response")
-            return candidates[:self.num_candidates]  # Limit to requested number
+            print(f"📊 Received {len(candidates)} candidates")
+            return candidates
             
         except Exception as e:
             print(f"❌ Error generating candidates: {e}")
             return []
 
-    def _select_best_candidate(self, candidates: List[str]) -> Tuple[str, str]:
+    async def _select_best_candidate(self, candidates: List[str]) -> Tuple[str, str]:
         """Use preference optimization to select best candidate."""
+        # A single candidate wins by default; skip the evaluator call
+        if len(candidates) == 1:
+            print("🎯 DPO selected the only valid candidate")
+            return candidates[0], "Single valid candidate, preference evaluation skipped"
+        
         try:
             # Format candidates for evaluation
-            candidates_text = ""
-            for i, candidate in enumerate(candidates, 1):
-                candidates_text += f"CANDIDATE {i}: {candidate}\n\n"
+            candidates_text = "".join(
+                f"CANDIDATE {i}: {candidate}\n\n" for i, candidate in enumerate(candidates, 1)
+            )
             
             prompt = self.prompts['preference_evaluation'].format(
                 num_candidates=len(candidates),
                 candidates=candidates_text
             )
             
-            response = self.openai_client.chat.completions.create(
-                model=self.config['openai']['model'],
+            response = await self._chat(
                 messages=[{"role": "user", "content": prompt}],
                 max_tokens=600,
                 temperature=0.3  # Lower temperature for consistent evaluation
@@ -210,21 +248,14 @@ SELECTED WINNER: [paste the full winning field note here]"""
             evaluation = response.choices[0].message.content.strip()
             
             # Extract the selected winner
-            lines = evaluation.split('\n')
-            selected = ""
-            
-            for line in lines:
-                if line.strip().startswith('SELECTED WINNER:'):
-                    if ':' in line:
-                        selected = line.split(':', 1)[1].strip()
-                        break
+            match = _WINNER_RE.search(evaluation)
+            selected = match.group(1) if match else ""
             
             # Fallback: extract any line with the signature emoji
             if not selected:
-                for line in lines:
-                    if '🔄' in line and len(line.strip()) > 20:
-                        selected = line.strip()
-                        break
+                selected = next(
+                    (m.group(1) for m in _SIGNED_LINE_RE.finditer(evaluation) if len(m.group(1)) > 20), ""
+                )
             
             # Final fallback: use first candidate
             if not selected and candidates:
@@ -238,27 +269,38 @@ SELECTED WINNER: [paste the full winning field note here]"""
             print(f"❌ Error in preference selection: {e}")
             return (candidates[0] if candidates else "", str(e))
 
-    def _passes_moderation(self, content: str) -> bool:
-        """Check content against OpenAI moderation API."""
+    def _ranked_candidates(self, candidates: List[str], ranking: str) -> List[str]:
+        """Candidates in the evaluator's RANKING order (empty if it couldn't be parsed)."""
+        ranked = []
+        for match in _RANKED_RE.finditer(ranking):
+            index = int(match.group(1)) - 1
+            if 0 <= index < len(candidates) and candidates[index] not in ranked:
+                ranked.append(candidates[index])
+        return ranked
+
+    async def _passes_moderation(self, content: str) -> bool:
+        """Check content against OpenAI moderation API (verdicts are cached by content)."""
+        key = hashlib.blake2b(content.encode(), digest_size=16).hexdigest()
+        if key in _moderation_cache:
+            _moderation_cache.move_to_end(key)
+            return _moderation_cache[key]
+        
         try:
-            response = self.openai_client.moderations.create(input=content)
-            return not response.results[0].flagged
+            async with self.limiter.acquire():
+                response = await self.openai_client.moderations.create(input=content)
+            verdict = not response.results[0].flagged
         except Exception as e:
             print(f"⚠️ Moderation check failed: {e}")
-            return True
+            return True  # Allow if moderation fails (not cached, so it's retried next time)
+        
+        _moderation_cache[key] = verdict
+        if len(_moderation_cache) > _MODERATION_CACHE_SIZE:
+            _moderation_cache.popitem(last=False)
+        return verdict
 
     def _generate_fallback_post(self) -> str:
         """Generate a safe fallback field note with DPO signature."""
-        fallbacks = [
-            "Ahoy! Spotted Amazon's Alexa using preference optimization to rank responses - millions of daily interactions teaching it what humans prefer. Smart learning from choices! 🔄",
-            
-            "Matey! Found Google Search using ML ranking models trained on billions of clicks. Their preference optimization decides which results ye see first. Treasure navigation! 🔄",
-            
-            "Avast! Discovered YouTube's recommendation engine using DPO-style training on viewer choices. 2B+ hours watched daily = massive preference dataset! 🔄"
-        ]
-        
-        import random
-        return random.choice(fallbacks)
+        return random.choice(_FALLBACKS)
 
     def validate_post(self, content: str) -> bool:
         """Validate field note meets DPO requirements."""
@@ -274,20 +316,13 @@ SELECTED WINNER: [paste the full winning field note here]"""
             return False
         
         # Check for pirate elements
-        pirate_indicators = [
-            'ahoy', 'matey', 'avast', 'spotted', 'discovered', 'treasure',
-            'crew', 'ship', 'sail', 'adventure', 'voyage', 'aboard', 'found'
-        ]
-        
-        content_lower = content.lower()
-        has_pirate_tone = any(indicator in content_lower for indicator in pirate_indicators)
+        has_pirate_tone = _PIRATE_RE.search(content) is not None
         
         if not has_pirate_tone:
             print("⚠️ Weak pirate tone detected, but allowing...")
         
         # Check for prohibited content
-        prohibited = ['crypto', 'trading', 'buy', 'sell', 'investment advice']
-        if any(word in content_lower for word in prohibited):
+        if _PROHIBITED_RE.search(content):
             print("❌ Contains prohibited content")
             return False
         
@@ -1,14 +1,16 @@
 """Main orchestrator for the Bluesky Bot Showdown."""
 
-import json
+import asyncio
+import copy
+import orjson
 import sqlite3
-import schedule
 import time
 import logging
 import sys
 import os
 from datetime import datetime, timedelta
-from typing import Dict, Any, List, Optional
+from itertools import cycle
+from typing import Dict, Any, List, Optional, Tuple
 from pathlib import Path
 
 # Add current directory to Python path for imports
@@ -24,6 +26,32 @@ except ImportError:
 
 from scripts.self_refine_bot import SelfRefineBot
 from scripts.dpo_bot import DPOBot
+from scripts.base_bot import ns_to_iso
+
+
+# Parsed config files keyed by (path, mtime), so an unchanged file is only parsed once
+_CONFIG_CACHE: Dict[Tuple[str, int], Dict[str, Any]] = {}
+
+# Insert statements, shared so sqlite3's statement cache reuses the compiled form
+_SQL_INSERT_POST = '''
+    INSERT OR REPLACE INTO posts 
+    (uri, cid, bot_type, content, timestamp, likes, reposts, replies, posted_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+'''
+_SQL_INSERT_PROCESS = '''
+    INSERT INTO post_process 
+    (timestamp, bot_type, prompt, initial_draft, critique, refined_post, improvement_made, post_success, error_message)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+'''
+_SQL_INSERT_METRICS = '''
+    INSERT OR REPLACE INTO metrics 
+    (timestamp, followers, total_posts, total_likes, total_reposts, bot_stats)
+    VALUES (?, ?, ?, ?, ?, ?)
+'''
+
+# Post process rows are buffered and written this many at a time (and on every
+# metrics collection and at shutdown)
+PROCESS_BATCH_SIZE = 64
 
 
 class BotOrchestrator:
@@ -40,24 +68,39 @@ class BotOrchestrator:
         )
         self.logger = logging.getLogger("Orchestrator")
         
+        # Status lines go to stdout through the logger only, instead of being
+        # printed and then logged again
+        if not self.logger.handlers:
+            console = logging.StreamHandler(sys.stdout)
+            console.setFormatter(logging.Formatter("%(message)s"))
+            self.logger.addHandler(console)
+            self.logger.propagate = False
+        
         # Initialize W&B if available
         self.wandb_table = None
         self._init_wandb()
         
         # Initialize database
         self.db_path = "bot_showdown.db"
+        self._process_buffer: List[tuple] = []
         self._init_database()
         
         # Initialize bots
         self.bots = self._initialize_bots()
-        self.current_bot_index = 0
+        self._bot_rotation = cycle(self.bots)
+        self.current_bot = self.bots[0] if self.bots else None
+        # Reused by every metrics snapshot instead of building a new dict
+        self._bot_stats_scratch: Dict[str, Dict[str, Any]] = {bot.bot_type: {} for bot in self.bots}
         
         # State
         self.is_running = False
         self.start_time = None
+        self._deadline: Optional[datetime] = None
+        self._stop_handle: Optional[asyncio.TimerHandle] = None
+        self._tasks: List[asyncio.Task] = []
+        self._next_run: Dict[str, datetime] = {}
         
-        print(f"🤖 Orchestrator initialized with {len(self.bots)} bots")
-        self.logger.info(f"Orchestrator initialized with {len(self.bots)} bots")
+        self.logger.info("🤖 Orchestrator initialized with %d bots", len(self.bots))
     
     def _init_wandb(self):
         """Initialize Weights & Biases logging."""
@@ -73,8 +116,9 @@ class BotOrchestrator:
                     }
                 )
                 
-                # Create W&B table for tracking post generation process
-                self.wandb_table = wandb.Table(columns=[
+                # Create W&B table for tracking post generation process (incremental,
+                # so each log uploads only the rows added since the previous one)
+                self.wandb_table = wandb.Table(log_mode="INCREMENTAL", columns=[
                     "timestamp",
                     "bot_type", 
                     "prompt",
@@ -91,11 +135,9 @@ class BotOrchestrator:
                     "error_message"
                 ])
                 
-                print("✅ W&B logging initialized with post tracking table")
-                self.logger.info("W&B logging initialized with post tracking table")
+                self.logger.info("✅ W&B logging initialized with post tracking table")
             except Exception as e:
-                print(f"⚠️ W&B initialization failed: {e}")
-                self.logger.warning(f"W&B initialization failed: {e}")
+                self.logger.warning("⚠️ W&B initialization failed: %s", e)
         else:
             print("⚠️ W&B not available - install with: pip install wandb")
     
@@ -103,52 +145,65 @@ class BotOrchestrator:
         """Log the complete post generation process to W&B table."""
         if WANDB_AVAILABLE and self.wandb_table is not None:
             try:
+                # Look up each field once
+                initial_draft = process_data.get('initial_draft', '')
+                critique = process_data.get('critique', '')
+                refined_post = process_data.get('refined_post', '')
+                improvement_made = process_data.get('improvement_made', False)
+                post_posted = process_data.get('post_posted', False)
+                post_success = process_data.get('post_success', False)
+                
                 # Calculate character change
-                initial_length = len(process_data.get('initial_draft', ''))
-                refined_length = len(process_data.get('refined_post', ''))
+                initial_length = len(initial_draft)
+                refined_length = len(refined_post)
                 character_change = refined_length - initial_length
                 
+                timestamp_ns = process_data['timestamp_ns']
+                
                 self.wandb_table.add_data(
-                    process_data.get('timestamp', datetime.now().isoformat()),
+                    ns_to_iso(timestamp_ns),
                     process_data.get('bot_type', 'unknown'),
                     process_data.get('prompt', ''),
-                    process_data.get('initial_draft', ''),
-                    len(process_data.get('initial_draft', '')),
-                    process_data.get('critique', ''),
-                    len(process_data.get('critique', '')),
-                    process_data.get('refined_post', ''),
-                    len(process_data.get('refined_post', '')),
-                    process_data.get('improvement_made', False),
+                    initial_draft,
+                    initial_length,
+                    critique,
+                    len(critique),
+                    refined_post,
+                    refined_length,
+                    improvement_made,
                     character_change,
-                    process_data.get('post_posted', False),
-                    process_data.get('post_success', False),
+                    post_posted,
+                    post_success,
                     process_data.get('error_message', '')
                 )
                 
-                # Log the table to W&B
-                wandb.log({"post_generation_process": self.wandb_table})
-                
-                # Also log individual metrics
+                # Log the table and the individual metrics as one history row
                 wandb.log({
-                    "post_posted": 1 if process_data.get('post_posted', False) else 0,
-                    "post_length": len(process_data.get('refined_post', '')),
-                    "improvement_made": 1 if process_data.get('improvement_made', False) else 0,
+                    "post_generation_process": self.wandb_table,
+                    "post_posted": 1 if post_posted else 0,
+                    "post_length": refined_length,
+                    "improvement_made": 1 if improvement_made else 0,
                     "character_change": character_change,
-                    "post_success": 1 if process_data.get('post_success', False) else 0,
-                    "timestamp": datetime.now().timestamp()
+                    "post_success": 1 if post_success else 0,
+                    "timestamp": timestamp_ns / 1e9
                 })
                 
                 print(f"📊 Logged post process to W&B table")
                 
             except Exception as e:
-                print(f"⚠️ Failed to log to W&B table: {e}")
-                self.logger.warning(f"Failed to log to W&B table: {e}")
+                self.logger.warning("⚠️ Failed to log to W&B table: %s", e)
     
     def _load_config(self) -> Dict[str, Any]:
-        """Load configuration from JSON file."""
+        """Load configuration from JSON file (parsed once per file version).
+        
+        Each caller gets its own deep copy, so edits never leak into the cache.
+        """
         try:
-            with open(self.config_path, 'r') as f:
-                config = json.load(f)
+            key = (self.config_path, os.stat(self.config_path).st_mtime_ns)
+            if key in _CONFIG_CACHE:
+                return copy.deepcopy(_CONFIG_CACHE[key])
+            
+            config = orjson.loads(Path(self.config_path).read_bytes())
             
             # Validate required keys
             required_keys = ['bluesky', 'openai', 'bots', 'posting', 'rules']
@@ -156,20 +211,29 @@ class BotOrchestrator:
             if missing_keys:
                 raise ValueError(f"Missing required config keys: {missing_keys}")
             
-            return config
+            _CONFIG_CACHE[key] = config
+            return copy.deepcopy(config)
             
         except FileNotFoundError:
             self.logger.error(f"Config file not found: {self.config_path}")
             self.logger.info("Please copy config/bot_config.example.json to config/bot_config.json and add your API keys")
             raise
-        except json.JSONDecodeError as e:
+        except orjson.JSONDecodeError as e:
             self.logger.error(f"Invalid JSON in config file: {e}")
             raise
     
     def _init_database(self):
         """Initialize SQLite database for storing posts and metrics."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        # One long-lived connection for all writes; WAL + synchronous=NORMAL
+        # avoids a journal fsync on every single-row insert
+        self.conn = sqlite3.connect(
+            self.db_path, isolation_level=None, check_same_thread=False, cached_statements=128
+        )
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA temp_store=MEMORY")
+        self.conn.execute("PRAGMA cache_size=-20000")
+        cursor = self.conn.cursor()
         
         # Create posts table
         cursor.execute('''
@@ -214,11 +278,23 @@ class BotOrchestrator:
             )
         ''')
         
-        conn.commit()
-        conn.close()
+        # Running totals for _collect_metrics, seeded once from the existing rows
+        # and then bumped on every insert instead of re-aggregating the tables
+        total_posts, total_likes, total_reposts = cursor.execute(
+            'SELECT COUNT(*), SUM(likes), SUM(reposts) FROM posts'
+        ).fetchone()
+        total_attempts, successful_improvements = cursor.execute(
+            'SELECT COUNT(*), SUM(improvement_made) FROM post_process'
+        ).fetchone()
+        self._counters = {
+            'total_posts': total_posts,
+            'total_likes': total_likes or 0,
+            'total_reposts': total_reposts or 0,
+            'successful_improvements': successful_improvements or 0,
+            'total_attempts': total_attempts
+        }
         
-        print("✅ Database initialized with post process tracking")
-        self.logger.info("Database initialized with post process tracking")
+        self.logger.info("✅ Database initialized with post process tracking")
     
     def _initialize_bots(self) -> List:
         """Initialize all enabled bots."""
@@ -242,61 +318,86 @@ class BotOrchestrator:
         return bots
     
     def start(self):
-        """Start the bot showdown."""
+        """Start the bot showdown (blocking wrapper around start_async)."""
+        try:
+            asyncio.run(self.start_async())
+        except KeyboardInterrupt:
+            pass
+    
+    async def start_async(self):
+        """Start the bot showdown on the running event loop."""
         if self.is_running:
             self.logger.warning("Orchestrator is already running")
             return
         
         self.is_running = True
         self.start_time = datetime.now()
+        self._deadline = self.start_time + timedelta(days=self.config['project']['duration_days'])
         
-        # Schedule round-robin posting
         shift_interval = self.config['posting']['shift_interval_minutes']
-        schedule.every(shift_interval).minutes.do(self._post_next)
         
-        # Schedule metrics collection
-        schedule.every(5).minutes.do(self._collect_metrics)
-        
-        print(f"\n🚀 Bluesky Bot Showdown started! Posting every {shift_interval} minutes")
-        print(f"🎯 Goal: {self.config['project']['target_followers']} followers in {self.config['project']['duration_days']} days")
+        self.logger.info("\n🚀 Bluesky Bot Showdown started! Posting every %s minutes", shift_interval)
+        self.logger.info(
+            "🎯 Goal: %s followers in %s days",
+            self.config['project']['target_followers'], self.config['project']['duration_days']
+        )
         print("=" * 60)
         
-        self.logger.info(f"🚀 Bot Showdown started! Posting every {shift_interval} minutes")
-        self.logger.info(f"Goal: {self.config['project']['target_followers']} followers in {self.config['project']['duration_days']} days")
-        
         # Post initial content immediately
         print("📝 Generating first post...")
-        self._post_next()
+        await self._post_next()
+        
+        # Stop once, at the deadline, instead of polling the clock every minute
+        # TODO: Also stop when the follower goal is reached (needs the Bluesky API)
+        self._stop_handle = asyncio.get_running_loop().call_later(
+            max(0.0, (self._deadline - datetime.now()).total_seconds()), self._on_deadline
+        )
         
-        # Main loop
+        # Round-robin posting and metrics collection run side by side, so a
+        # slow post no longer delays metrics (or vice versa)
+        self._tasks = [
+            asyncio.create_task(self._every(shift_interval * 60, self._post_next)),
+            asyncio.create_task(self._every(5 * 60, self._collect_metrics))
+        ]
         try:
-            while self.is_running:
-                schedule.run_pending()
-                time.sleep(60)  # Check every minute
-                
-                # Check if we should stop (duration reached or goal achieved)
-                if self._should_stop():
-                    self.stop()
-                    
-        except KeyboardInterrupt:
-            print("\n🛑 Received interrupt signal, stopping...")
-            self.logger.info("Received interrupt signal, stopping...")
+            await asyncio.gather(*self._tasks)
+        except asyncio.CancelledError:
+            if self.is_running:  # interrupted rather than stopped
+                self.logger.info("\n🛑 Received interrupt signal, stopping...")
+                self.stop()
+                raise
+    
+    async def _every(self, seconds: float, job):
+        """Run a job every `seconds` until stopped; a failing run doesn't end the loop."""
+        while self.is_running:
+            self._next_run[job.__name__] = datetime.now() + timedelta(seconds=seconds)
+            await asyncio.sleep(seconds)
+            try:
+                if asyncio.iscoroutinefunction(job):
+                    await job()
+                else:
+                    job()
+            except Exception as e:
+                self.logger.error("❌ Scheduled %s failed: %s", job.__name__, e)
+    
+    def _on_deadline(self):
+        """Stop the showdown when the configured duration is up."""
+        if self.is_running:
+            self.logger.info("🏁 Duration limit reached")
             self.stop()
     
-    def _post_next(self):
+    async def _post_next(self):
         """Post content from the next bot in rotation."""
         if not self.bots:
-            print("❌ No enabled bots available")
-            self.logger.error("No enabled bots available")
+            self.logger.error("❌ No enabled bots available")
             return
         
         # Get next bot
-        current_bot = self.bots[self.current_bot_index]
-        self.current_bot_index = (self.current_bot_index + 1) % len(self.bots)
+        current_bot = self.current_bot = next(self._bot_rotation)
         
         # Initialize process tracking
         process_data = {
-            'timestamp': datetime.now().isoformat(),
+            'timestamp_ns': time.time_ns(),
             'bot_type': current_bot.bot_type,
             'post_posted': False,
             'post_success': False,
@@ -304,12 +405,11 @@ class BotOrchestrator:
         }
         
         try:
-            print(f"\n🎯 {current_bot.name} starting post generation...")
+            self.logger.info("\n🎯 %s starting post generation...", current_bot.name)
             print("=" * 50)
             
             # Generate post and get process details
-            self.logger.info(f"🎯 {current_bot.name} generating post...")
-            post_content, refinement_details = current_bot.generate_post_with_details()
+            post_content, refinement_details = await current_bot.agenerate_post_with_details()
             
             # Update process data with refinement details
             process_data.update(refinement_details)
@@ -321,10 +421,8 @@ class BotOrchestrator:
             
             # Validate post
             if not current_bot.validate_post(post_content):
-                print("❌ Post validation failed!")
-                print(f"Content: {post_content[:50]}...")
+                self.logger.warning("❌ Post validation failed: %s...", post_content[:50])
                 process_data['error_message'] = 'Post validation failed'
-                self.logger.warning(f"Post validation failed: {post_content[:50]}...")
                 
                 # Log failed attempt
                 self._save_post_process(process_data)
@@ -335,47 +433,41 @@ class BotOrchestrator:
             
             # Post to Bluesky
             print("\n🦋 Attempting to post to Bluesky...")
-            post_data = current_bot.post_to_bluesky(post_content)
+            post_data = await asyncio.to_thread(current_bot.post_to_bluesky, post_content)
             
             if post_data:
-                # Save to database
-                self._save_post(post_data)
+                # Save the post and its process details to the database together
                 process_data['post_success'] = True
-                print(f"✅ Successfully posted to Bluesky!")
-                print(f"Post URI: {post_data['uri']}")
-                
-                self.logger.info(f"✅ Posted: {post_content[:50]}...")
+                self._save_post(post_data, process_data)
+                self.logger.info("✅ Successfully posted to Bluesky! Post URI: %s", post_data['uri'])
             else:
-                print("❌ Failed to post to Bluesky")
+                self.logger.error("❌ Failed to post to Bluesky")
                 process_data['error_message'] = 'Bluesky API posting failed'
-                self.logger.error("Failed to post to Bluesky")
+                self._save_post_process(process_data)
             
             print("=" * 50)
             
-            # Save process details to database and W&B
-            self._save_post_process(process_data)
+            # Log process details to W&B
             self.log_post_process_to_wandb(process_data)
                 
         except Exception as e:
-            print(f"❌ Error during post generation/posting: {e}")
+            self.logger.error("❌ Error during post generation/posting: %s", e)
             process_data['error_message'] = str(e)
-            self.logger.error(f"Error during post generation/posting: {e}")
             
             # Log error
             self._save_post_process(process_data)
             self.log_post_process_to_wandb(process_data)
     
-    def _save_post_process(self, process_data: Dict[str, Any]):
-        """Save post generation process to database."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            INSERT INTO post_process 
-            (timestamp, bot_type, prompt, initial_draft, critique, refined_post, improvement_made, post_success, error_message)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (
-            process_data.get('timestamp'),
+    def _count_attempt(self, process_data: Dict[str, Any]):
+        """Add a saved attempt to the running totals."""
+        self._counters['total_attempts'] += 1
+        if process_data.get('improvement_made', False):
+            self._counters['successful_improvements'] += 1
+    
+    def _process_row(self, process_data: Dict[str, Any]) -> tuple:
+        """Build the post_process row for an attempt."""
+        return (
+            ns_to_iso(process_data['timestamp_ns']),
             process_data.get('bot_type'),
             process_data.get('prompt', ''),
             process_data.get('initial_draft', ''),
@@ -384,36 +476,55 @@ class BotOrchestrator:
             process_data.get('improvement_made', False),
             process_data.get('post_success', False),
             process_data.get('error_message', '')
-        ))
-        
-        conn.commit()
-        conn.close()
+        )
+    
+    def _save_post_process(self, process_data: Dict[str, Any]):
+        """Queue a failed attempt's process details for the database (written in batches)."""
+        self._process_buffer.append(self._process_row(process_data))
+        self._count_attempt(process_data)
+        if len(self._process_buffer) >= PROCESS_BATCH_SIZE:
+            self._flush_process_buffer()
         
-        print(f"💾 Post process saved to database")
+        print(f"💾 Post process queued for database")
     
-    def _save_post(self, post_data: Dict[str, Any]):
-        """Save post data to database."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+    def _flush_process_buffer(self):
+        """Write queued post process rows in a single transaction."""
+        if not self._process_buffer:
+            return
         
-        cursor.execute('''
-            INSERT OR REPLACE INTO posts 
-            (uri, cid, bot_type, content, timestamp, likes, reposts, replies, posted_at)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (
-            post_data['uri'],
-            post_data['cid'],
-            post_data['bot_type'],
-            post_data['text'],
-            post_data['timestamp'],
-            post_data['likes'],
-            post_data['reposts'],
-            post_data['replies'],
-            datetime.now().isoformat()
-        ))
-        
-        conn.commit()
-        conn.close()
+        with self.conn:
+            self.conn.execute("BEGIN")
+            self.conn.executemany(_SQL_INSERT_PROCESS, self._process_buffer)
+        self._process_buffer.clear()
+    
+    def _save_post(self, post_data: Dict[str, Any], process_data: Dict[str, Any]):
+        """Save post data and its process details to database, along with any queued process rows."""
+        # The post was created on Bluesky when post_data was built
+        posted_at = ns_to_iso(post_data['timestamp_ns'])
+        
+        # One transaction (and one commit) covers the post, its process row and
+        # the backlog of failed attempts
+        with self.conn:
+            self.conn.execute("BEGIN")
+            self.conn.execute(_SQL_INSERT_POST, (
+                post_data['uri'],
+                post_data['cid'],
+                post_data['bot_type'],
+                post_data['text'],
+                posted_at,
+                post_data['likes'],
+                post_data['reposts'],
+                post_data['replies'],
+                posted_at
+            ))
+            self.conn.execute(_SQL_INSERT_PROCESS, self._process_row(process_data))
+            if self._process_buffer:
+                self.conn.executemany(_SQL_INSERT_PROCESS, self._process_buffer)
+        self._process_buffer.clear()
+        self._count_attempt(process_data)
+        self._counters['total_posts'] += 1
+        self._counters['total_likes'] += post_data['likes']
+        self._counters['total_reposts'] += post_data['reposts']
         
         print(f"💾 Post saved to database")
     
@@ -423,54 +534,39 @@ class BotOrchestrator:
             # Get current follower count (mock for now)
             # TODO: Implement actual Bluesky API call to get follower count
             followers = 42  # Mock data
+            now = datetime.now()
             
-            # Get post stats from database
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            cursor.execute('SELECT COUNT(*) FROM posts')
-            total_posts = cursor.fetchone()[0]
-            
-            cursor.execute('SELECT SUM(likes), SUM(reposts) FROM posts')
-            result = cursor.fetchone()
-            total_likes = result[0] or 0
-            total_reposts = result[1] or 0
+            # Write out queued process rows so the dashboard sees them
+            self._flush_process_buffer()
             
-            # Get process stats
-            cursor.execute('SELECT COUNT(*) FROM post_process WHERE improvement_made = 1')
-            successful_improvements = cursor.fetchone()[0]
-            
-            cursor.execute('SELECT COUNT(*) FROM post_process')
-            total_attempts = cursor.fetchone()[0]
-            
-            conn.close()
+            # Get post and process stats from the running totals
+            counters = self._counters
+            total_posts = counters['total_posts']
+            total_likes = counters['total_likes']
+            total_reposts = counters['total_reposts']
+            successful_improvements = counters['successful_improvements']
+            total_attempts = counters['total_attempts']
             
             # Collect bot stats
-            bot_stats = {}
+            bot_stats = self._bot_stats_scratch
             for bot in self.bots:
                 bot_stats[bot.bot_type] = bot.get_stats()
             
             # Save metrics
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            cursor.execute('''
-                INSERT OR REPLACE INTO metrics 
-                (timestamp, followers, total_posts, total_likes, total_reposts, bot_stats)
-                VALUES (?, ?, ?, ?, ?, ?)
-            ''', (
-                datetime.now().isoformat(),
-                followers,
-                total_posts,
-                total_likes,
-                total_reposts,
-                json.dumps(bot_stats)
-            ))
+            with self.conn:
+                self.conn.execute(_SQL_INSERT_METRICS, (
+                    now.isoformat(),
+                    followers,
+                    total_posts,
+                    total_likes,
+                    total_reposts,
+                    orjson.dumps(bot_stats).decode()
+                ))
             
-            conn.commit()
-            conn.close()
-            
-            print(f"📊 Metrics: {followers} followers, {total_posts} posts, {total_likes} likes, {successful_improvements}/{total_attempts} improvements")
+            self.logger.info(
+                "📊 Metrics: %s followers, %s posts, %s likes, %s/%s improvements",
+                followers, total_posts, total_likes, successful_improvements, total_attempts
+            )
             
             # Log to W&B
             if WANDB_AVAILABLE:
@@ -483,57 +579,41 @@ class BotOrchestrator:
                     "successful_improvements": successful_improvements,
                     "total_attempts": total_attempts,
                     "improvement_rate": improvement_rate,
-                    "timestamp": datetime.now().timestamp()
+                    "timestamp": now.timestamp()
                 })
             
-            self.logger.info(f"📊 Metrics: {followers} followers, {total_posts} posts, {total_likes} likes")
-            
         except Exception as e:
-            print(f"❌ Error collecting metrics: {e}")
-            self.logger.error(f"Error collecting metrics: {e}")
-    
-    def _should_stop(self) -> bool:
-        """Check if orchestrator should stop."""
-        if not self.start_time:
-            return False
-        
-        # Check duration
-        duration = datetime.now() - self.start_time
-        max_duration = timedelta(days=self.config['project']['duration_days'])
-        
-        if duration > max_duration:
-            print("🏁 Duration limit reached")
-            self.logger.info("🏁 Duration limit reached")
-            return True
-        
-        # TODO: Check if follower goal reached
-        # This would require actual Bluesky API integration
-        
-        return False
+            self.logger.error("❌ Error collecting metrics: %s", e)
     
     def stop(self):
         """Stop the bot showdown."""
         self.is_running = False
-        schedule.clear()
+        if self._stop_handle:
+            self._stop_handle.cancel()
+        for task in self._tasks:
+            task.cancel()
         
         if self.start_time:
             duration = datetime.now() - self.start_time
-            print(f"🛑 Bot Showdown stopped after {duration}")
-            self.logger.info(f"🛑 Bot Showdown stopped after {duration}")
+            self.logger.info("🛑 Bot Showdown stopped after %s", duration)
         
         # Final metrics collection
         self._collect_metrics()
         
-        print("\n📊 Final stats:")
-        self.logger.info("Final stats:")
+        self.logger.info("\n📊 Final stats:")
         for bot in self.bots:
             stats = bot.get_stats()
-            print(f"  {stats['name']}: {stats['stats']['posts_created']} posts, {stats['stats']['improvements_made']} improvements")
-            self.logger.info(f"  {stats['name']}: {stats['stats']['posts_created']} posts, {stats['stats']['improvements_made']} improvements")
+            self.logger.info(
+                "  %s: %s posts, %s improvements",
+                stats['name'], stats['stats']['posts_created'], stats['stats']['improvements_made']
+            )
         
         # Close W&B
         if WANDB_AVAILABLE:
             wandb.finish()
+        
+        self._flush_process_buffer()
+        self.conn.close()
     
     def get_status(self) -> Dict[str, Any]:
         """Get current orchestrator status."""
@@ -541,15 +621,15 @@ class BotOrchestrator:
             'is_running': self.is_running,
             'start_time': self.start_time.isoformat() if self.start_time else None,
             'active_bots': len(self.bots),
-            'current_bot': self.bots[self.current_bot_index].name if self.bots else None,
+            'current_bot': self.current_bot.name if self.current_bot else None,
             'next_post_in': self._get_next_post_time()
         }
     
     def _get_next_post_time(self) -> Optional[str]:
         """Get time until next scheduled post."""
-        next_job = schedule.next_run()
-        if next_job:
-            return next_job.isoformat()
+        next_post = self._next_run.get('_post_next')
+        if next_post:
+            return next_post.isoformat()
         return None
 
 
@@ -0,0 +1,90 @@
+"""Rate-limited, retrying submission of chat completion requests.
+
+Follows the OpenAI cookbook's api_request_parallel_processor: every request
+waits on the shared AsyncRateLimiter for capacity, and transient failures
+(429s, dropped connections, 5xx) are retried with exponential backoff
+instead of failing the whole batch.
+"""
+
+import asyncio
+import random
+from contextlib import AsyncExitStack
+from typing import Any, Dict, List
+
+from openai import APIConnectionError, InternalServerError, RateLimitError
+
+from scripts.rate_limiter import AsyncRateLimiter, estimate_tokens
+
+RETRYABLE_ERRORS = (RateLimitError, APIConnectionError, InternalServerError)
+
+
+class LimitedStream:
+    """A streamed completion that keeps its rate limiter slot until closed.
+    
+    The completion is still generating while the caller iterates, so the slot
+    (and with it the max_concurrent cap) is released by close(), not when
+    create() returns.
+    """
+    
+    def __init__(self, stream, slot: AsyncExitStack):
+        self._stream = stream
+        self._slot = slot
+    
+    def __aiter__(self):
+        return self._stream.__aiter__()
+    
+    async def close(self):
+        """Close the underlying stream and release the limiter slot (idempotent)."""
+        try:
+            await self._stream.close()
+        finally:
+            await self._slot.aclose()
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+
+async def _open_stream(client, limiter: AsyncRateLimiter, request: Dict[str, Any], tokens: int) -> LimitedStream:
+    """Take a limiter slot and start a streamed completion that holds it."""
+    slot = AsyncExitStack()
+    await slot.enter_async_context(limiter.acquire(tokens))
+    try:
+        stream = await client.chat.completions.create(**request)
+    except BaseException:
+        await slot.aclose()
+        raise
+    return LimitedStream(stream, slot)
+
+
+async def submit_request(client, limiter: AsyncRateLimiter, request: Dict[str, Any], max_attempts: int = 3,
+                         sleep=asyncio.sleep):
+    """Send one chat completion request, retrying transient failures.
+
+    `request` holds the keyword arguments for chat.completions.create
+    (model, messages, max_tokens, temperature and optionally n). With
+    stream=True the result is a LimitedStream, which must be closed.
+    `sleep` waits out the backoff between attempts (tests pass a no-op).
+    """
+    tokens = estimate_tokens(request['messages'], request['max_tokens'] * request.get('n', 1))
+    for attempt in range(1, max_attempts + 1):
+        try:
+            if request.get('stream'):
+                return await _open_stream(client, limiter, request, tokens)
+            async with limiter.acquire(tokens):
+                return await client.chat.completions.create(**request)
+        except RETRYABLE_ERRORS:
+            if attempt == max_attempts:
+                raise
+            await sleep(2 ** attempt + random.random())
+
+
+async def process_requests(client, limiter: AsyncRateLimiter, requests: List[Dict[str, Any]],
+                           max_attempts: int = 3) -> List[Any]:
+    """Run a batch of requests concurrently; results (or exceptions) come back in request order."""
+    return await asyncio.gather(
+        *(submit_request(client, limiter, request, max_attempts) for request in requests),
+        return_exceptions=True
+    )
@@ -3,28 +3,71 @@ Preference Manager for Interactive AI Bot Training
 Handles storing and applying user preferences to live bot deployment
 """
 
-import json
+import orjson
+import re
 import sqlite3
 import os
+import threading
+import time
+from collections import Counter
 from datetime import datetime
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 from pathlib import Path
 
 
+# Keywords tallied in high-rated posts, in reporting order
+_PIRATE_WORDS = ('ahoy', 'matey', 'avast', 'spotted', 'discovered', 'treasure', 'crew', 'ship')
+_TECH_TERMS = ('AI', 'ML', 'GPT', 'neural', 'algorithm', 'machine learning', 'deep learning')
+
+# One pass per post finds every keyword; the lookahead also catches
+# overlapping matches, so this agrees with a per-keyword `in` check
+_PIRATE_WORDS_RE = re.compile("(?=(%s))" % "|".join(re.escape(w.lower()) for w in _PIRATE_WORDS))
+_TECH_TERMS_RE = re.compile("(?=(%s))" % "|".join(re.escape(t.lower()) for t in _TECH_TERMS))
+
+# How long an active model config is served from memory; a deploy in this
+# process invalidates it at once, one in another process shows up within this
+ACTIVE_CONFIG_TTL_SECONDS = 30.0
+
+
+def _count_posts_containing(pattern: re.Pattern, lowered_posts: List[str]) -> Counter:
+    """Count, per lowercased keyword, how many posts contain it."""
+    return Counter(
+        keyword for post in lowered_posts for keyword in set(pattern.findall(post))
+    )
+
+
 class PreferenceManager:
     """Manages user preferences and applies them to bot deployment."""
     
     def __init__(self, db_path: str = "preferences.db"):
         self.db_path = db_path
+        # One connection for the manager's lifetime; the lock keeps the app's
+        # session threads from interleaving statements on it
+        self._lock = threading.Lock()
+        # technique -> (monotonic time fetched, active config JSON or None);
+        # guarded by self._lock, and parsed on every hit so callers never share a dict
+        self._active_config_cache: Dict[str, Tuple[float, Optional[str]]] = {}
         self._init_database()
     
+    def _get_conn(self) -> sqlite3.Connection:
+        """Get the manager's connection (opened once; hold self._lock while using it)."""
+        return self._conn
+    
     def _init_database(self):
         """Initialize preference database."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        self._conn = conn = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None)
+        
+        # WAL lets the app's status reads run alongside training writes, and
+        # NORMAL sync only fsyncs at checkpoints (safe under WAL)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA busy_timeout=5000")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("PRAGMA cache_size=-20000")
+        conn.execute("PRAGMA mmap_size=268435456")
         
         # Create preferences table
-        cursor.execute('''
+        conn.execute('''
             CREATE TABLE IF NOT EXISTS user_preferences (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                 timestamp TEXT,
@@ -36,7 +79,7 @@ class PreferenceManager:
         ''')
         
         # Create deployed_models table
-        cursor.execute('''
+        conn.execute('''
             CREATE TABLE IF NOT EXISTS deployed_models (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                 timestamp TEXT,
@@ -47,31 +90,51 @@ class PreferenceManager:
             )
         ''')
         
-        conn.commit()
-        conn.close()
+        # Index the session lookup and the active-model lookup (which can then
+        # skip its ORDER BY sort)
+        conn.execute('''
+            CREATE INDEX IF NOT EXISTS idx_prefs_session
+            ON user_preferences(session_id, timestamp)
+        ''')
+        conn.execute('''
+            CREATE INDEX IF NOT EXISTS idx_models_active
+            ON deployed_models(technique, status, timestamp DESC)
+        ''')
+        
+        # Refresh planner statistics where they are stale
+        conn.execute("PRAGMA optimize")
     
     def save_dpo_training_session(self, session_data: Dict[str, Any], session_id: str) -> int:
         """Save DPO training session data."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            INSERT INTO user_preferences 
-            (timestamp, technique, session_id, preferences_data, deployed)
-            VALUES (?, ?, ?, ?, ?)
-        ''', (
-            datetime.now().isoformat(),
-            'dpo',
-            session_id,
-            json.dumps(session_data),
-            False
-        ))
-        
-        preference_id = cursor.lastrowid
-        conn.commit()
-        conn.close()
-        
-        return preference_id
+        return self.save_dpo_training_sessions([(session_data, session_id)])[0]
+    
+    def save_dpo_training_sessions(self, sessions: List[Tuple[Dict[str, Any], str]]) -> List[int]:
+        """Save several (session_data, session_id) pairs in one transaction.
+        
+        Returns the new preference IDs in the same order.
+        """
+        conn = self._get_conn()
+        now = datetime.now().isoformat()
+        preference_ids = []
+        
+        with self._lock, conn:
+            conn.execute("BEGIN")
+            for session_data, session_id in sessions:
+                cursor = conn.execute('''
+                    INSERT INTO user_preferences 
+                    (timestamp, technique, session_id, preferences_data, deployed)
+                    VALUES (?, ?, ?, ?, ?)
+                ''', (
+                    now,
+                    'dpo',
+                    session_id,
+                    # Rating dicts are keyed by candidate number, hence NON_STR_KEYS
+                    orjson.dumps(session_data, option=orjson.OPT_NON_STR_KEYS).decode(),
+                    False
+                ))
+                preference_ids.append(cursor.lastrowid)
+        
+        return preference_ids
     
     def deploy_dpo_model(self, session_id: str, training_examples: int) -> Dict[str, Any]:
         """Deploy a DPO model based on training session."""
@@ -81,92 +144,87 @@ class PreferenceManager:
         if not training_data:
             raise ValueError(f"No training data found for session {session_id}")
         
-        # Create model configuration
-        model_config = self._create_dpo_model_config(training_data)
-        
-        # Save deployed model
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        # Mark previous models as inactive
-        cursor.execute('''
-            UPDATE deployed_models 
-            SET status = 'inactive' 
-            WHERE technique = 'dpo'
-        ''')
-        
-        # Insert new model
-        cursor.execute('''
-            INSERT INTO deployed_models 
-            (timestamp, technique, model_config, training_examples, status)
-            VALUES (?, ?, ?, ?, ?)
-        ''', (
-            datetime.now().isoformat(),
-            'dpo',
-            json.dumps(model_config),
-            training_examples,
-            'active'
-        ))
+        # Create model configuration (one timestamp for the whole deployment)
+        now = datetime.now().isoformat()
+        model_config = self._create_dpo_model_config(training_data, now)
         
-        # Mark training session as deployed
-        cursor.execute('''
-            UPDATE user_preferences 
-            SET deployed = TRUE 
-            WHERE session_id = ? AND technique = 'dpo'
-        ''', (session_id,))
+        # Save deployed model; the three writes commit together
+        conn = self._get_conn()
         
-        conn.commit()
-        conn.close()
+        with self._lock, conn:
+            conn.execute("BEGIN")
+            
+            # Mark previous models as inactive
+            conn.execute('''
+                UPDATE deployed_models 
+                SET status = 'inactive' 
+                WHERE technique = 'dpo'
+            ''')
+            
+            # Insert new model
+            conn.execute('''
+                INSERT INTO deployed_models 
+                (timestamp, technique, model_config, training_examples, status)
+                VALUES (?, ?, ?, ?, ?)
+            ''', (
+                now,
+                'dpo',
+                orjson.dumps(model_config).decode(),
+                training_examples,
+                'active'
+            ))
+            
+            # Mark training session as deployed
+            conn.execute('''
+                UPDATE user_preferences 
+                SET deployed = TRUE 
+                WHERE session_id = ? AND technique = 'dpo'
+            ''', (session_id,))
+            
+            self._active_config_cache.pop('dpo', None)
         
         return {
             'status': 'deployed',
             'model_config': model_config,
             'training_examples': training_examples,
-            'timestamp': datetime.now().isoformat()
+            'timestamp': now
         }
     
     def get_active_model_config(self, technique: str) -> Optional[Dict[str, Any]]:
-        """Get active model configuration for a technique."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            SELECT model_config FROM deployed_models 
-            WHERE technique = ? AND status = 'active'
-            ORDER BY timestamp DESC
-            LIMIT 1
-        ''', (technique,))
-        
-        result = cursor.fetchone()
-        conn.close()
-        
-        if result:
-            return json.loads(result[0])
-        return None
+        """Get active model configuration for a technique (cached for ACTIVE_CONFIG_TTL_SECONDS)."""
+        with self._lock:
+            cached = self._active_config_cache.get(technique)
+            if cached and time.monotonic() - cached[0] < ACTIVE_CONFIG_TTL_SECONDS:
+                config_json = cached[1]
+            else:
+                result = self._get_conn().execute('''
+                    SELECT model_config FROM deployed_models 
+                    WHERE technique = ? AND status = 'active'
+                    ORDER BY timestamp DESC
+                    LIMIT 1
+                ''', (technique,)).fetchone()
+                config_json = result[0] if result else None
+                self._active_config_cache[technique] = (time.monotonic(), config_json)
+        
+        return orjson.loads(config_json) if config_json is not None else None
     
     def get_training_data(self, session_id: str) -> List[Dict[str, Any]]:
         """Get training data for a session."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            SELECT preferences_data FROM user_preferences 
-            WHERE session_id = ?
-            ORDER BY timestamp ASC
-        ''', (session_id,))
-        
-        results = cursor.fetchall()
-        conn.close()
-        
-        training_data = []
-        for result in results:
-            data = json.loads(result[0])
-            training_data.extend(data.get('dpo_learning_data', []))
-        
-        return training_data
+        # JSON1 unpacks each row's dpo_learning_data array in SQLite, so only
+        # the examples themselves come back (one per row, in saved order)
+        with self._lock:
+            results = self._get_conn().execute('''
+                SELECT examples.value
+                FROM user_preferences, json_each(user_preferences.preferences_data, '$.dpo_learning_data') AS examples
+                WHERE user_preferences.session_id = ?
+                ORDER BY user_preferences.timestamp ASC, user_preferences.id ASC, examples.key ASC
+            ''', (session_id,)).fetchall()
+        
+        return [orjson.loads(result[0]) for result in results]
     
-    def _create_dpo_model_config(self, training_data: List[Dict[str, Any]]) -> Dict[str, Any]:
-        """Create DPO model configuration from training data."""
+    def _create_dpo_model_config(self, training_data: List[Dict[str, Any]],
+                                 now: Optional[str] = None) -> Dict[str, Any]:
+        """Create DPO model configuration from training data (`now` is the ISO training date)."""
         
         # Analyze training data to extract preferences
         preferred_features = {
@@ -192,20 +250,18 @@ class PreferenceManager:
             # Calculate average length of preferred posts
             preferred_features['avg_length'] = sum(len(post) for post in high_rated_examples) // len(high_rated_examples)
             
+            lowered_posts = [post.lower() for post in high_rated_examples]
+            
             # Extract common pirate words
-            pirate_words = ['ahoy', 'matey', 'avast', 'spotted', 'discovered', 'treasure', 'crew', 'ship']
-            word_counts = {}
-            for word in pirate_words:
-                count = sum(1 for post in high_rated_examples if word.lower() in post.lower())
-                if count > 0:
-                    word_counts[word] = count
+            pirate_counts = _count_posts_containing(_PIRATE_WORDS_RE, lowered_posts)
+            word_counts = {word: pirate_counts[word] for word in _PIRATE_WORDS if pirate_counts[word] > 0}
             
             preferred_features['pirate_words'] = sorted(word_counts.items(), key=lambda x: x[1], reverse=True)
             
             # Extract mentioned companies/technologies
-            tech_terms = ['AI', 'ML', 'GPT', 'neural', 'algorithm', 'machine learning', 'deep learning']
-            for term in tech_terms:
-                count = sum(1 for post in high_rated_examples if term.lower() in post.lower())
+            tech_counts = _count_posts_containing(_TECH_TERMS_RE, lowered_posts)
+            for term in _TECH_TERMS:
+                count = tech_counts[term.lower()]
                 if count > 0:
                     preferred_features['tech_companies'].append((term, count))
         
@@ -220,47 +276,45 @@ class PreferenceManager:
         preferred_features['training_metadata'] = {
             'total_examples': total_examples,
             'high_rated_examples': len(high_rated_examples),
-            'training_date': datetime.now().isoformat()
+            'training_date': now or datetime.now().isoformat()
         }
         
         return preferred_features
     
     def get_deployment_status(self) -> Dict[str, Any]:
         """Get current deployment status."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        # Get active models
-        cursor.execute('''
-            SELECT technique, model_config, training_examples, timestamp 
-            FROM deployed_models 
-            WHERE status = 'active'
-            ORDER BY timestamp DESC
-        ''')
-        
+        # One statement returns the session counts (one aggregate row) joined
+        # to each active model, and JSON1 pulls out just the metadata preview
+        with self._lock:
+            rows = self._get_conn().execute('''
+                SELECT sessions.total_sessions, sessions.deployed_sessions,
+                       models.technique, models.training_examples, models.timestamp,
+                       json_extract(models.model_config, '$.training_metadata')
+                FROM (
+                    SELECT COUNT(*) as total_sessions,
+                           SUM(CASE WHEN deployed = TRUE THEN 1 ELSE 0 END) as deployed_sessions
+                    FROM user_preferences
+                ) AS sessions
+                LEFT JOIN deployed_models AS models ON models.status = 'active'
+                ORDER BY models.timestamp DESC
+            ''').fetchall()
+        
+        stats = rows[0]
         active_models = []
-        for row in cursor.fetchall():
+        for row in rows:
+            if row[2] is None:  # no active models
+                continue
             active_models.append({
-                'technique': row[0],
-                'training_examples': row[2],
-                'deployed_at': row[3],
-                'config_preview': json.loads(row[1]).get('training_metadata', {})
+                'technique': row[2],
+                'training_examples': row[3],
+                'deployed_at': row[4],
+                'config_preview': orjson.loads(row[5]) if row[5] is not None else {}
             })
         
-        # Get training sessions
-        cursor.execute('''
-            SELECT COUNT(*) as total_sessions,
-                   SUM(CASE WHEN deployed = TRUE THEN 1 ELSE 0 END) as deployed_sessions
-            FROM user_preferences
-        ''')
-        
-        stats = cursor.fetchone()
-        conn.close()
-        
         return {
             'active_models': active_models,
-            'total_training_sessions': stats[0] if stats else 0,
-            'deployed_sessions': stats[1] if stats else 0
+            'total_training_sessions': stats[0],
+            'deployed_sessions': stats[1]
         }
 
 
@@ -0,0 +1,64 @@
+"""Client-side rate limiting for OpenAI requests made by the bots."""
+
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from functools import lru_cache
+from typing import AsyncIterator, Dict, List
+
+
+class AsyncRateLimiter:
+    """Keeps requests just under the account's requests/tokens per minute.
+
+    Capacity refills continuously (the OpenAI cookbook token-bucket scheme),
+    and a semaphore caps how many requests are in flight at once, so bursts
+    wait locally instead of bouncing off 429s and backing off.
+    """
+
+    def __init__(self, rpm: int = 500, tpm: int = 200_000, max_concurrent: int = 10):
+        self.rpm = rpm
+        self.tpm = tpm
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+        self._lock = asyncio.Lock()
+        self._request_capacity = float(rpm)
+        self._token_capacity = float(tpm)
+        self._last_refill = time.monotonic()
+
+    def _refill(self):
+        """Top up both buckets for the time elapsed since the last refill."""
+        now = time.monotonic()
+        elapsed = now - self._last_refill
+        self._last_refill = now
+        self._request_capacity = min(self.rpm, self._request_capacity + self.rpm * elapsed / 60)
+        self._token_capacity = min(self.tpm, self._token_capacity + self.tpm * elapsed / 60)
+
+    @asynccontextmanager
+    async def acquire(self, estimated_tokens: int = 0) -> AsyncIterator[None]:
+        """Wait for a request slot and enough token budget, then hold the slot."""
+        estimated_tokens = min(estimated_tokens, self.tpm)
+        async with self._semaphore:
+            async with self._lock:
+                while True:
+                    self._refill()
+                    if self._request_capacity >= 1 and self._token_capacity >= estimated_tokens:
+                        self._request_capacity -= 1
+                        self._token_capacity -= estimated_tokens
+                        break
+                    wait = max(
+                        (1 - self._request_capacity) * 60 / self.rpm,
+                        (estimated_tokens - self._token_capacity) * 60 / self.tpm,
+                        0.01
+                    )
+                    await asyncio.sleep(wait)
+            yield
+
+
+@lru_cache(maxsize=None)
+def get_rate_limiter(rpm: int, tpm: int, max_concurrent: int) -> AsyncRateLimiter:
+    """Get the process-wide limiter for a given set of limits (shared by all bots)."""
+    return AsyncRateLimiter(rpm, tpm, max_concurrent)
+
+
+def estimate_tokens(messages: List[Dict[str, str]], max_tokens: int) -> int:
+    """Rough token cost of a chat request: ~4 characters per prompt token plus the completion budget."""
+    return sum(len(message['content']) for message in messages) // 4 + max_tokens
@@ -3,12 +3,31 @@ Self-Refine Bot for AI Field Notes - Pirate's Adventure
 Generates, critiques, and refines field notes about real-world AI deployments
 """
 
-import json
+import asyncio
+import random
 import re
+import time
 import requests
-from datetime import datetime
 from typing import Dict, Any, Tuple, Optional
-from scripts.base_bot import BaseBot
+from scripts.base_bot import BaseBot, run_sync
+
+# Tone and content checks for validate_post, compiled once
+_PIRATE_RE = re.compile(
+    r'ahoy|matey|avast|spotted|discovered|treasure|crew|ship|sail|adventure|voyage|aboard',
+    re.IGNORECASE | re.ASCII
+)
+_PROHIBITED_RE = re.compile(r'\b(?:crypto|trading|buy|sell|investment advice)', re.IGNORECASE | re.ASCII)
+
+# Drafts and refinements stop streaming past this length; validate_post
+# rejects anything over 300 anyway, and this leaves room for the emoji
+_POST_STREAM_CUTOFF = 320
+
+# Safe field notes used when generation fails
+_FALLBACKS = (
+    "Ahoy! Just discovered GitHub Copilot helping developers code 55% faster in enterprise ships. Microsoft's AI mate is revolutionizing how crews build software. Every line counts on the digital seas! ✍️",
+    "Matey! Spotted Grammarly's AI writing assistant used by 30M+ sailors worldwide. Their ML checks grammar, tone, and clarity in real-time. Clean communication = successful voyages! ✍️",
+    "Avast! Found Notion's AI features helping teams organize knowledge 40% faster. Auto-summaries and smart search keep crews aligned. Information management be the new treasure! ✍️"
+)
 
 
 class SelfRefineBot(BaseBot):
@@ -85,14 +104,25 @@ Rewrite the field note incorporating the feedback. Maintain the pirate voice whi
 
 Write the improved field note:"""
         }
+        
+        # Split the templates around their placeholders once, so each post's
+        # prompts are joined together instead of re-parsed by str.format
+        self._prompt_preview = self.prompts['generate'][:200] + "..."
+        self._critique_parts = self.prompts['critique'].split("{draft}")
+        refine_head, refine_rest = self.prompts['refine'].split("{draft}", 1)
+        self._refine_parts = (refine_head, *refine_rest.split("{critique}", 1))
 
     def generate_post_with_details(self) -> Tuple[str, Dict[str, Any]]:
+        """Generate a field note with full self-refine process details (blocking)."""
+        return run_sync(self.agenerate_post_with_details())
+
+    async def agenerate_post_with_details(self) -> Tuple[str, Dict[str, Any]]:
         """Generate a field note with full self-refine process details."""
         
         process_details = {
-            'timestamp': datetime.now().isoformat(),
+            'timestamp_ns': time.time_ns(),
             'bot_type': self.bot_type,
-            'prompt': self.prompts['generate'][:200] + "...",
+            'prompt': self._prompt_preview,
             'improvement_made': False,
             'error_message': ''
         }
@@ -101,67 +131,64 @@ Write the improved field note:"""
             print("🏴‍☠️ Generating AI field note...")
             
             # Step 1: Generate initial draft
-            initial_response = self.openai_client.chat.completions.create(
-                model=self.config['openai']['model'],
+            initial_draft = await self._chat_text(
                 messages=[{"role": "user", "content": self.prompts['generate']}],
                 max_tokens=400,
-                temperature=0.8
+                temperature=0.8,
+                max_chars=_POST_STREAM_CUTOFF
             )
-            initial_draft = initial_response.choices[0].message.content.strip()
             process_details['initial_draft'] = initial_draft
             
             print(f"📝 Initial draft: {initial_draft}")
             print(f"Length: {len(initial_draft)} characters")
             
+            # Step 2: Self-critique, started while the draft is still in moderation
+            print("\n🔍 Self-critiquing...")
+            critique_prompt = initial_draft.join(self._critique_parts)
+            
+            critique_task = asyncio.create_task(self._chat_text(
+                messages=[{"role": "user", "content": critique_prompt}],
+                max_tokens=500,
+                temperature=0.3
+            ))
+            
             # Check moderation if enabled
             if self.use_moderation:
-                if not self._passes_moderation(initial_draft):
+                if not await self._passes_moderation(initial_draft):
+                    critique_task.cancel()
                     process_details['error_message'] = 'Content flagged by moderation'
                     print("⚠️ Content flagged by OpenAI moderation")
                     return self._generate_fallback_post(), process_details
             
-            # Step 2: Self-critique  
-            print("\n🔍 Self-critiquing...")
-            critique_prompt = self.prompts['critique'].format(draft=initial_draft)
-            
-            critique_response = self.openai_client.chat.completions.create(
-                model=self.config['openai']['model'],
-                messages=[{"role": "user", "content": critique_prompt}],
-                max_tokens=500,
-                temperature=0.3
-            )
-            critique = critique_response.choices[0].message.content.strip()
+            critique = await critique_task
             process_details['critique'] = critique
             
             print(f"🔍 Critique: {critique[:100]}...")
             
             # Step 3: Refine based on critique
             print("\n✍️ Refining field note...")
-            refine_prompt = self.prompts['refine'].format(
-                draft=initial_draft,
-                critique=critique
-            )
+            refine_head, refine_mid, refine_tail = self._refine_parts
+            refine_prompt = "".join((refine_head, initial_draft, refine_mid, critique, refine_tail))
             
-            refined_response = self.openai_client.chat.completions.create(
-                model=self.config['openai']['model'],
+            refined_post = await self._chat_text(
                 messages=[{"role": "user", "content": refine_prompt}],
                 max_tokens=400,
-                temperature=0.7
+                temperature=0.7,
+                max_chars=_POST_STREAM_CUTOFF
             )
-            refined_post = refined_response.choices[0].message.content.strip()
             process_details['refined_post'] = refined_post
             
             print(f"✨ Refined post: {refined_post}")
             print(f"Length: {len(refined_post)} characters")
             
             # Check if improvement was made
-            if len(refined_post) != len(initial_draft) or refined_post != initial_draft:
+            if refined_post != initial_draft:
                 process_details['improvement_made'] = True
                 print("✅ Improvement detected!")
             
             # Final moderation check
             if self.use_moderation:
-                if not self._passes_moderation(refined_post):
+                if not await self._passes_moderation(refined_post):
                     print("⚠️ Refined content flagged by moderation, using initial draft")
                     return initial_draft, process_details
             
@@ -172,10 +199,11 @@ Write the improved field note:"""
             process_details['error_message'] = str(e)
             return self._generate_fallback_post(), process_details
 
-    def _passes_moderation(self, content: str) -> bool:
+    async def _passes_moderation(self, content: str) -> bool:
         """Check content against OpenAI moderation API."""
         try:
-            response = self.openai_client.moderations.create(input=content)
+            async with self.limiter.acquire():
+                response = await self.openai_client.moderations.create(input=content)
             return not response.results[0].flagged
         except Exception as e:
             print(f"⚠️ Moderation check failed: {e}")
@@ -183,16 +211,7 @@ Write the improved field note:"""
 
     def _generate_fallback_post(self) -> str:
         """Generate a safe fallback field note."""
-        fallbacks = [
-            "Ahoy! Just discovered GitHub Copilot helping developers code 55% faster in enterprise ships. Microsoft's AI mate is revolutionizing how crews build software. Every line counts on the digital seas! ✍️",
-            
-            "Matey! Spotted Grammarly's AI writing assistant used by 30M+ sailors worldwide. Their ML checks grammar, tone, and clarity in real-time. Clean communication = successful voyages! ✍️",
-            
-            "Avast! Found Notion's AI features helping teams organize knowledge 40% faster. Auto-summaries and smart search keep crews aligned. Information management be the new treasure! ✍️"
-        ]
-        
-        import random
-        return random.choice(fallbacks)
+        return random.choice(_FALLBACKS)
 
     def validate_post(self, content: str) -> bool:
         """Validate field note meets requirements."""
@@ -208,20 +227,13 @@ Write the improved field note:"""
             return False
         
         # Check for basic pirate elements (not too strict)
-        pirate_indicators = [
-            'ahoy', 'matey', 'avast', 'spotted', 'discovered', 'treasure',
-            'crew', 'ship', 'sail', 'adventure', 'voyage', 'aboard'
-        ]
-        
-        content_lower = content.lower()
-        has_pirate_tone = any(indicator in content_lower for indicator in pirate_indicators)
+        has_pirate_tone = _PIRATE_RE.search(content) is not None
         
         if not has_pirate_tone:
             print("⚠️ Weak pirate tone detected, but allowing...")
         
         # Check for prohibited content
-        prohibited = ['crypto', 'trading', 'buy', 'sell', 'investment advice']
-        if any(word in content_lower for word in prohibited):
+        if _PROHIBITED_RE.search(content):
             print("❌ Contains prohibited content")
             return False
         
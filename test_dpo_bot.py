@@ -84,6 +84,75 @@ def test_dpo_bot():
         print(f"❌ Error testing DPO bot: {e}")
         return False
 
+def test_flagged_winner_uses_ranking():
+    """Test that a flagged winner is replaced by the next-ranked clean candidate."""
+    print("\n🛡️ Testing flagged winner replacement")
+    print("=" * 40)
+    
+    try:
+        import asyncio
+        from scripts.dpo_bot import DPOBot
+        
+        candidates = [f"Ahoy! Field note number {i} about preference optimization 🔄" for i in range(1, 5)]
+        ranking = (
+            "RANKING:\n"
+            "1. Candidate 3 - sharpest\n"
+            "2. Candidate 1 - flagged\n"
+            "3. Candidate 4 - solid\n"
+            "4. Candidate 2 - weakest\n\n"
+            f"SELECTED WINNER: {candidates[2]}"
+        )
+        flagged = {candidates[2], candidates[0]}
+        
+        class StubBot(DPOBot):
+            def improve(self, feedback):
+                pass
+            
+            def get_improvement_status(self):
+                return {}
+        
+        # Skip __init__ (no API clients needed); stub the model calls
+        bot = StubBot.__new__(StubBot)
+        bot.bot_type = "dpo"
+        bot.use_moderation = True
+        bot.validate_post = lambda content: True
+        
+        async def generate_candidates():
+            return candidates
+        
+        async def select_best(cands):
+            return candidates[2], ranking
+        
+        async def passes_moderation(content):
+            return content not in flagged
+        
+        bot._generate_candidates = generate_candidates
+        bot._select_best_candidate = select_best
+        bot._passes_moderation = passes_moderation
+        
+        post, details = asyncio.run(bot.agenerate_post_with_details())
+        if post != candidates[3]:
+            print(f"❌ Expected the next-ranked clean candidate, got: {post}")
+            return False
+        print("✅ Next-ranked clean candidate used")
+        
+        # Without a parseable ranking, fall back instead of guessing
+        async def select_unranked(cands):
+            return candidates[2], "No ranking here"
+        
+        bot._select_best_candidate = select_unranked
+        post, details = asyncio.run(bot.agenerate_post_with_details())
+        if post in candidates or details['error_message'] != 'Content flagged by moderation':
+            print(f"❌ Expected the fallback post, got: {post}")
+            return False
+        print("✅ Fallback post used when the ranking can't be read")
+        
+        return True
+        
+    except Exception as e:
+        print(f"❌ Error testing flagged winner replacement: {e}")
+        return False
+
 def test_orchestrator_integration():
     """Test that orchestrator can import and use DPO bot."""
     print("\n🤖 Testing Orchestrator Integration")
@@ -126,6 +195,7 @@ def main():
     
     tests = [
         test_dpo_bot,
+        test_flagged_winner_uses_ranking,
         test_orchestrator_integration
     ]
     
@@ -213,7 +213,14 @@ def test_preference_manager():
         session_id = "test_session_123"
         preference_id = pm.save_dpo_training_session(test_session_data, session_id)
         print(f"✅ Training session with config saved with ID: {preference_id}")
-        
+
+        # Test saving a batch of sessions in one transaction
+        batch_ids = pm.save_dpo_training_sessions([(test_session_data, session_id)] * 2)
+        if batch_ids != [preference_id + 1, preference_id + 2]:
+            print(f"❌ Unexpected batch IDs: {batch_ids}")
+            return False
+        print(f"✅ Batch of training sessions saved with IDs: {batch_ids}")
+
         # Test deployment
         deployment_result = pm.deploy_dpo_model(session_id, 1)
         print("✅ DPO model deployment successful")
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Test the OpenAI request rate limiter
+"""
+
+import sys
+import asyncio
+import time
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+def test_request_throttling():
+    """Test that requests beyond the bucket wait for capacity to refill."""
+    print("⏱️ Testing request throttling")
+    print("=" * 40)
+
+    try:
+        from scripts.rate_limiter import AsyncRateLimiter
+
+        async def run():
+            # 120 rpm refills two requests per second
+            limiter = AsyncRateLimiter(rpm=120, tpm=100_000, max_concurrent=5)
+            limiter._request_capacity = 1
+
+            async def request():
+                async with limiter.acquire(10):
+                    pass
+
+            start = time.monotonic()
+            await asyncio.gather(*(request() for _ in range(3)))
+            return time.monotonic() - start
+
+        elapsed = asyncio.run(run())
+        if elapsed < 0.9:
+            print(f"❌ Requests were not throttled ({elapsed:.2f}s)")
+            return False
+
+        print(f"✅ Three requests with one slot available took {elapsed:.2f}s")
+        return True
+
+    except Exception as e:
+        print(f"❌ Error testing throttling: {e}")
+        return False
+
+def test_token_estimate():
+    """Test the prompt + completion token estimate."""
+    print("\n🔢 Testing token estimate")
+    print("=" * 40)
+
+    try:
+        from scripts.rate_limiter import estimate_tokens
+
+        messages = [{"role": "user", "content": "x" * 400}]
+        estimate = estimate_tokens(messages, 100)
+        if estimate != 200:
+            print(f"❌ Unexpected estimate: {estimate}")
+            return False
+
+        print("✅ Token estimate covers prompt and completion budget")
+        return True
+
+    except Exception as e:
+        print(f"❌ Error testing token estimate: {e}")
+        return False
+
+def test_retry_on_rate_limit():
+    """Test that a 429 is retried instead of failing the request."""
+    print("\n🔁 Testing retry on rate limit")
+    print("=" * 40)
+
+    try:
+        import httpx
+        from types import SimpleNamespace
+        from openai import RateLimitError
+        from scripts import parallel_processor
+        from scripts.rate_limiter import AsyncRateLimiter
+
+        attempts = []
+
+        async def create(**kwargs):
+            attempts.append(kwargs)
+            if len(attempts) == 1:
+                response = httpx.Response(429, request=httpx.Request("POST", "https://api.openai.com"))
+                raise RateLimitError("Rate limit reached", response=response, body=None)
+            return "completion"
+
+        async def no_sleep(seconds):
+            pass
+
+        client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+        request = {
+            'model': 'gpt-4o-mini',
+            'messages': [{"role": "user", "content": "Ahoy!"}],
+            'max_tokens': 10,
+            'temperature': 0.5
+        }
+
+        result = asyncio.run(
+            parallel_processor.submit_request(client, AsyncRateLimiter(), request, sleep=no_sleep)
+        )
+
+        if result != "completion" or len(attempts) != 2:
+            print(f"❌ Expected one retry, got {len(attempts)} attempts")
+            return False
+
+        print("✅ Rate-limited request retried and succeeded")
+        return True
+
+    except Exception as e:
+        print(f"❌ Error testing retry: {e}")
+        return False
+
+def test_stream_holds_slot():
+    """Test that a streamed request keeps its concurrency slot until the stream is closed."""
+    print("\n🌊 Testing streamed request concurrency")
+    print("=" * 40)
+
+    try:
+        from types import SimpleNamespace
+        from scripts.parallel_processor import submit_request
+        from scripts.rate_limiter import AsyncRateLimiter
+
+        class FakeStream:
+            closed = False
+
+            async def close(self):
+                self.closed = True
+
+        async def create(**kwargs):
+            return FakeStream()
+
+        client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+        request = {
+            'model': 'gpt-4o-mini',
+            'messages': [{"role": "user", "content": "Ahoy!"}],
+            'max_tokens': 10,
+            'temperature': 0.5,
+            'stream': True
+        }
+
+        async def run():
+            limiter = AsyncRateLimiter(max_concurrent=1)
+            stream = await submit_request(client, limiter, request)
+            held = limiter._semaphore.locked()
+            await stream.close()
+            return held, limiter._semaphore.locked()
+
+        held, still_held = asyncio.run(run())
+        if not held or still_held:
+            print(f"❌ Slot held while streaming: {held}, after close: {still_held}")
+            return False
+
+        print("✅ Stream held its slot until closed")
+        return True
+
+    except Exception as e:
+        print(f"❌ Error testing streamed concurrency: {e}")
+        return False
+
+def main():
+    """Run all rate limiter tests."""
+    print("⏱️ Rate Limiter Test Suite")
+    print("=" * 50)
+
+    tests = [
+        test_request_throttling,
+        test_token_estimate,
+        test_retry_on_rate_limit,
+        test_stream_holds_slot
+    ]
+
+    results = []
+    for test in tests:
+        results.append(test())
+
+    print("\n" + "=" * 50)
+
+    if all(results):
+        print("🎉 ALL RATE LIMITER TESTS PASSED!")
+        return 0
+    else:
+        print("❌ Some rate limiter tests failed")
+        return 1
+
+if __name__ == "__main__":
+    sys.exit(main())
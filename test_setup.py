@@ -56,7 +56,6 @@ def test_imports():
         'pandas',
         'matplotlib',
         'plotly',
-        'schedule',
         'sqlite3'
     ]
     
@@ -125,6 +124,64 @@ def test_bot_creation():
         print(f"  ❌ Import error: {e}")
         return False
 
+def test_streamed_forbidden_words():
+    """Test that a forbidden word split across stream chunks is caught at a word start."""
+    print("🚫 Testing streamed forbidden-word check...")
+    
+    try:
+        import asyncio
+        from types import SimpleNamespace
+        from scripts.base_bot import BaseBot
+        
+        class StreamBot(BaseBot):
+            def improve(self, feedback):
+                pass
+            
+            def get_improvement_status(self):
+                return {}
+        
+        class FakeStream:
+            def __init__(self, parts):
+                self.parts = parts
+            
+            async def __aiter__(self):
+                for part in self.parts:
+                    yield SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=part))])
+            
+            async def close(self):
+                pass
+        
+        config = {
+            'openai': {'api_key': 'test', 'model': 'gpt-4', 'max_tokens': 280, 'temperature': 0.7},
+            'bots': {'self_refine': {'emoji': '🪲', 'name': 'Self-Refine Bot', 'enabled': True}},
+            'rules': {'tone': 'educational', 'topics': ['AI/ML'], 'forbidden_words': ['sell'], 'max_hashtags': 3},
+            'bluesky': {'handle': 'test.bsky.social', 'app_password': 'test'}
+        }
+        bot = StreamBot(config, 'self_refine')
+        fallback = f"Working on self-improvement algorithms... {bot.emoji}"
+        
+        def generate(parts):
+            async def create(**kwargs):
+                return FakeStream(parts)
+            bot.openai_client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+            return asyncio.run(bot.agenerate_post("Write a post"))
+        
+        if generate(["best", "sell", "ers 🪲"]) == fallback:
+            print("  ❌ 'bestsellers' was rejected mid-stream")
+            return False
+        
+        for parts in (["we ", "sell", " things"], ["Top ", "sel", "lers 🪲"]):
+            if generate(parts) != fallback:
+                print(f"  ❌ '{''.join(parts)}' was not rejected")
+                return False
+        
+        print("  ✅ Forbidden words are rejected at a word start while streaming")
+        return True
+        
+    except Exception as e:
+        print(f"  ❌ Streaming check error: {e}")
+        return False
+
 def test_database():
     """Test database creation."""
     print("🗄️  Testing database...")
@@ -162,6 +219,7 @@ def main():
         test_imports,
         test_config,
         test_bot_creation,
+        test_streamed_forbidden_words,
         test_database
     ]
     